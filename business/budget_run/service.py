@@ -234,6 +234,7 @@ def _update_streak_and_badges(
     """Update streak and check for new badge eligibility."""
     streak = get_or_create_streak(user_id)
     new_badges: List[budget_run_repo.UserBadge] = []
+    eligible_badges: List[BadgeType] = []
 
     yesterday = target_date - timedelta(days=1)
     had_previous_streak = streak.current_streak > 0
@@ -253,16 +254,8 @@ def _update_streak_and_badges(
             streak_start = target_date
 
             # Check for comeback badge
-            if had_previous_streak and not budget_run_repo.has_badge(user_id, BadgeType.COMEBACK_KID):
-                badge = budget_run_repo.award_badge(
-                    user_id=user_id,
-                    badge_type=BadgeType.COMEBACK_KID,
-                    badge_name=BADGE_DEFINITIONS[BadgeType.COMEBACK_KID]["name"],
-                    badge_description=BADGE_DEFINITIONS[BadgeType.COMEBACK_KID]["description"],
-                    badge_icon=BADGE_DEFINITIONS[BadgeType.COMEBACK_KID]["icon"],
-                )
-                if badge:
-                    new_badges.append(badge)
+            if had_previous_streak:
+                eligible_badges.append(BadgeType.COMEBACK_KID)
 
         # Update streak record
         new_longest = max(streak.longest_streak, new_streak)
@@ -278,10 +271,18 @@ def _update_streak_and_badges(
         )
 
         # Check for streak-based badges
-        new_badges.extend(_check_streak_badges(user_id, new_streak))
+        eligible_badges.extend(_eligible_streak_badges(new_streak))
 
         # Check for total-days badges
-        new_badges.extend(_check_total_days_badges(user_id, new_total))
+        eligible_badges.extend(_eligible_total_days_badges(new_total))
+
+        # One statement awards everything eligible; ON CONFLICT skips badges the
+        # user already holds, so no per-badge has_badge() round trips are needed
+        new_badges.extend(
+            budget_run_repo.award_badges_bulk(
+                [_badge_entry(user_id, badge_type) for badge_type in eligible_badges]
+            )
+        )
 
     else:
         # Streak broken - reset current streak but keep history
@@ -298,10 +299,20 @@ def _update_streak_and_badges(
     return new_badges
 
 
-def _check_streak_badges(user_id: str, current_streak: int) -> List[budget_run_repo.UserBadge]:
-    """Check and award streak-based badges."""
-    new_badges: List[budget_run_repo.UserBadge] = []
+def _badge_entry(user_id: str, badge_type: BadgeType) -> dict:
+    """Build an award_badges_bulk entry from the badge definition."""
+    badge_def = BADGE_DEFINITIONS[badge_type]
+    return {
+        "user_id": user_id,
+        "badge_type": badge_type.value,
+        "badge_name": badge_def["name"],
+        "badge_description": badge_def["description"],
+        "badge_icon": badge_def["icon"],
+    }
 
+
+def _eligible_streak_badges(current_streak: int) -> List[BadgeType]:
+    """Streak-based badges the given streak qualifies for."""
     streak_badges = [
         (BadgeType.FIRST_WIN, 1),
         (BadgeType.BRONZE_SAVER, 3),
@@ -311,45 +322,25 @@ def _check_streak_badges(user_id: str, current_streak: int) -> List[budget_run_r
         (BadgeType.DIAMOND_SAVER, 100),
     ]
 
-    for badge_type, requirement in streak_badges:
-        if current_streak >= requirement and not budget_run_repo.has_badge(user_id, badge_type):
-            badge_def = BADGE_DEFINITIONS[badge_type]
-            badge = budget_run_repo.award_badge(
-                user_id=user_id,
-                badge_type=badge_type,
-                badge_name=badge_def["name"],
-                badge_description=badge_def["description"],
-                badge_icon=badge_def["icon"],
-            )
-            if badge:
-                new_badges.append(badge)
-
-    return new_badges
+    return [
+        badge_type
+        for badge_type, requirement in streak_badges
+        if current_streak >= requirement
+    ]
 
 
-def _check_total_days_badges(user_id: str, total_days: int) -> List[budget_run_repo.UserBadge]:
-    """Check and award total-days-based badges."""
-    new_badges: List[budget_run_repo.UserBadge] = []
-
+def _eligible_total_days_badges(total_days: int) -> List[BadgeType]:
+    """Total-days-based badges the given day count qualifies for."""
     total_badges = [
         (BadgeType.WEEK_WARRIOR, 7),
         (BadgeType.MONTH_MASTER, 30),
     ]
 
-    for badge_type, requirement in total_badges:
-        if total_days >= requirement and not budget_run_repo.has_badge(user_id, badge_type):
-            badge_def = BADGE_DEFINITIONS[badge_type]
-            badge = budget_run_repo.award_badge(
-                user_id=user_id,
-                badge_type=badge_type,
-                badge_name=badge_def["name"],
-                badge_description=badge_def["description"],
-                badge_icon=badge_def["icon"],
-            )
-            if badge:
-                new_badges.append(badge)
-
-    return new_badges
+    return [
+        badge_type
+        for badge_type, requirement in total_badges
+        if total_days >= requirement
+    ]
 
 
 # ============================================================================
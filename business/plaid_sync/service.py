@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Optional
 
 from business.plaid_sync import mappers
@@ -11,17 +13,21 @@ from business.transaction_categorization.models import (
     TransactionCategorizationRequestItem,
 )
 from business.transaction_categorization.prompts import CATEGORIES
-from business.transaction_categorization.service import categorize_transactions
+from business.transaction_categorization.service import (
+    categorize_transactions_batch,
+)
 from database.supabase import account as account_repo
 from database.supabase import plaid_item as plaid_item_repo
 from database.supabase import plaid_item_sync_state as sync_state_repo
 from database.supabase import transaction as transaction_repo
-from database.supabase.orm import get_connection
+from database.supabase.orm import borrow_connection
 from integrations.plaid import PlaidAPIError, PlaidClient
 
 logger = logging.getLogger(__name__)
 
 CATEGORIZATION_BATCH_SIZE = 20
+# Items synced at once per user; bounded to respect Plaid rate limits and the DB pool.
+SYNC_ITEM_CONCURRENCY = 4
 
 
 async def sync_item(
@@ -30,6 +36,23 @@ async def sync_item(
     item_db_id: str,
     item_external_id: str,
     user_id: str,
+) -> SyncSummary:
+    """Sync one item on a worker thread so the Plaid and psycopg2 calls don't block the event loop."""
+    return await asyncio.to_thread(
+        _sync_item,
+        plaid_client=plaid_client,
+        item_db_id=item_db_id,
+        item_external_id=item_external_id,
+        user_id=user_id,
+    )
+
+
+def _sync_item(
+    *,
+    plaid_client: PlaidClient,
+    item_db_id: str,
+    item_external_id: str,
+    user_id: str,
 ) -> SyncSummary:
     accounts_upserted = 0
     tx_added = 0
@@ -62,76 +85,24 @@ async def sync_item(
         )
 
     # Upsert accounts within one transaction
-    conn = get_connection()
-    try:
-        sync_state_repo.get_or_create_sync_state(conn, item_db_id)
-        for acct in accounts:
-            data = mappers.map_plaid_account_to_db_fields(
-                user_id=user_id, plaid_item_id=item_db_id, account=acct
-            )
-            account_repo.upsert_plaid_account(conn, **data)
-            accounts_upserted += 1
-        sync_state_repo.update_accounts_last_synced_at(conn, item_db_id)
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        logger.error(
-            json.dumps(
-                {
-                    "event": "plaid_sync.accounts_upsert_failed",
-                    "item_id": item_external_id,
-                    "error": str(e),
-                }
-            )
-        )
-        return SyncSummary(
-            plaid_item_id=item_external_id,
-            accounts_upserted=accounts_upserted,
-            tx_added=0,
-            tx_modified=0,
-            tx_removed=0,
-            has_more=False,
-            error_code="accounts_upsert_failed",
-            error_message=str(e),
-        )
-    finally:
-        conn.close()
-
-    # 2) Transactions delta sync loop
-    next_cursor: Optional[str] = None
-    # Load cursor
-    conn0 = get_connection()
-    try:
-        state = sync_state_repo.get_or_create_sync_state(conn0, item_db_id)
-        next_cursor = state.transactions_cursor
-        conn0.commit()
-    except Exception:
-        conn0.rollback()
-        raise
-    finally:
-        conn0.close()
-
-    page = 0
-    while True:
-        page += 1
+    with borrow_connection() as conn:
         try:
-            (
-                added,
-                modified,
-                removed,
-                next_cursor_out,
-                has_more,
-            ) = plaid_client.transactions_sync_page(
-                user_id=user_id, item_id=item_external_id, cursor=next_cursor
-            )
-        except PlaidAPIError as e:
-            # Continue other items: return summary with error attached
+            sync_state_repo.get_or_create_sync_state(conn, item_db_id)
+            for acct in accounts:
+                data = mappers.map_plaid_account_to_db_fields(
+                    user_id=user_id, plaid_item_id=item_db_id, account=acct
+                )
+                account_repo.upsert_plaid_account(conn, **data)
+                accounts_upserted += 1
+            sync_state_repo.update_accounts_last_synced_at(conn, item_db_id)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
             logger.error(
                 json.dumps(
                     {
-                        "event": "plaid_sync.transactions_sync_failed",
+                        "event": "plaid_sync.accounts_upsert_failed",
                         "item_id": item_external_id,
-                        "cursor": next_cursor,
                         "error": str(e),
                     }
                 )
@@ -139,100 +110,175 @@ async def sync_item(
             return SyncSummary(
                 plaid_item_id=item_external_id,
                 accounts_upserted=accounts_upserted,
-                tx_added=tx_added,
-                tx_modified=tx_modified,
-                tx_removed=tx_removed,
-                has_more=last_has_more,
-                error_code="transactions_sync_failed",
+                tx_added=0,
+                tx_modified=0,
+                tx_removed=0,
+                has_more=False,
+                error_code="accounts_upsert_failed",
                 error_message=str(e),
             )
 
-        # Process one page within a short DB transaction boundary
-        connp = get_connection()
+    # 2) Transactions delta sync loop
+    next_cursor: Optional[str] = None
+    # Load cursor
+    with borrow_connection() as conn0:
         try:
-            # Ensure accounts exist (already upserted) and map new transactions
-            for t in added:
-                plaid_account_id = getattr(t, "account_id")
-                account_id = account_repo.get_account_id_by_plaid_account_id(
-                    connp,
-                    user_id=user_id,
-                    plaid_item_id=item_db_id,
-                    plaid_account_id=plaid_account_id,
+            state = sync_state_repo.get_or_create_sync_state(conn0, item_db_id)
+            next_cursor = state.transactions_cursor
+            conn0.commit()
+        except Exception:
+            conn0.rollback()
+            raise
+
+    def _fetch_page(cursor: Optional[str]) -> Future:
+        return prefetch.submit(
+            plaid_client.transactions_sync_page,
+            user_id=user_id,
+            item_id=item_external_id,
+            cursor=cursor,
+        )
+
+    # Pages chain through the cursor, so they can't be fetched in parallel; but
+    # the next page can be in flight while the current one is written to the DB.
+    # Each sync owns its prefetch thread, so syncs don't queue behind each other.
+    prefetch = ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="plaid-sync-prefetch"
+    )
+    pending_page: Optional[Future] = None
+    try:
+        pending_page = _fetch_page(next_cursor)
+        page = 0
+        while True:
+            page += 1
+            try:
+                (
+                    added,
+                    modified,
+                    removed,
+                    next_cursor_out,
+                    has_more,
+                ) = pending_page.result()
+            except PlaidAPIError as e:
+                # Continue other items: return summary with error attached
+                logger.error(
+                    json.dumps(
+                        {
+                            "event": "plaid_sync.transactions_sync_failed",
+                            "item_id": item_external_id,
+                            "cursor": next_cursor,
+                            "error": str(e),
+                        }
+                    )
                 )
-                if not account_id:
-                    # Skip if account not found or not owned by user
-                    continue
-
-                # Pending → posted reconciliation
-                pending_id = getattr(t, "pending_transaction_id", None)
-                posted_id = getattr(t, "transaction_id", None)
-                tx_data = mappers.map_plaid_transaction_to_db_fields(
-                    account_id=account_id, transaction=t, account_owner_user_id=user_id
+                return SyncSummary(
+                    plaid_item_id=item_external_id,
+                    accounts_upserted=accounts_upserted,
+                    tx_added=tx_added,
+                    tx_modified=tx_modified,
+                    tx_removed=tx_removed,
+                    has_more=last_has_more,
+                    error_code="transactions_sync_failed",
+                    error_message=str(e),
                 )
-                if pending_id and posted_id:
-                    relinked = transaction_repo.relink_pending_to_posted(
-                        connp,
-                        pending_transaction_id=pending_id,
-                        posted_transaction_id=posted_id,
-                        posted_data=tx_data,
+
+            if has_more:
+                pending_page = _fetch_page(next_cursor_out)
+
+            # Process one page within a short DB transaction boundary
+            with borrow_connection() as connp:
+                try:
+                    # Map new transactions; the owning account (already upserted) is
+                    # resolved from plaid_account_id inside the bulk upsert.
+                    added_rows = []
+                    for t in added:
+                        # Pending → posted reconciliation
+                        pending_id = getattr(t, "pending_transaction_id", None)
+                        posted_id = getattr(t, "transaction_id", None)
+                        tx_data = mappers.map_plaid_transaction_to_db_fields(
+                            account_id="",  # resolved from plaid_account_id in the upsert
+                            transaction=t,
+                            account_owner_user_id=user_id,
+                        )
+                        if pending_id and posted_id:
+                            relinked = transaction_repo.relink_pending_to_posted(
+                                connp,
+                                user_id=user_id,
+                                plaid_item_id=item_db_id,
+                                plaid_account_id=getattr(t, "account_id"),
+                                pending_transaction_id=pending_id,
+                                posted_transaction_id=posted_id,
+                                posted_data=tx_data,
+                            )
+                            if relinked is not None:
+                                tx_modified += 1
+                                continue
+
+                        tx_data["plaid_account_id"] = getattr(t, "account_id")
+                        added_rows.append(tx_data)
+
+                    # Rows whose account is not found or not owned by the user are skipped
+                    tx_added += transaction_repo.upsert_transactions_added_bulk(
+                        connp, user_id=user_id, plaid_item_id=item_db_id, rows=added_rows
                     )
-                    if relinked:
-                        tx_modified += 1
-                        continue
-
-                transaction_repo.upsert_transaction_added(connp, data=tx_data)
-                tx_added += 1
-
-            for t in modified:
-                # Update mutable fields on existing record
-                tx_data = mappers.map_plaid_transaction_to_db_fields(
-                    account_id="",  # account_id immutable here; ignored in update
-                    transaction=t,
-                    account_owner_user_id=user_id,
-                )
-                tx_data["external_txn_id"] = getattr(t, "transaction_id", None)
-                transaction_repo.apply_transaction_modified(connp, data=tx_data)
-                tx_modified += 1
-
-            # Removed: soft-delete by external id, scoped to user
-            removed_ids = [getattr(r, "transaction_id") for r in removed]
-            transaction_repo.apply_transaction_removed(
-                connp, user_id=user_id, external_txn_ids=removed_ids
-            )
-            tx_removed += len(removed_ids)
 
-            # Persist cursor for the item
-            sync_state_repo.update_sync_cursor(connp, item_db_id, next_cursor_out)
-            last_has_more = has_more
-            connp.commit()
-        except Exception as e:
-            connp.rollback()
-            logger.error(
-                json.dumps(
-                    {
-                        "event": "plaid_sync.page_processing_failed",
-                        "item_id": item_external_id,
-                        "page": page,
-                        "error": str(e),
-                    }
-                )
-            )
-            return SyncSummary(
-                plaid_item_id=item_external_id,
-                accounts_upserted=accounts_upserted,
-                tx_added=tx_added,
-                tx_modified=tx_modified,
-                tx_removed=tx_removed,
-                has_more=last_has_more,
-                error_code="page_processing_failed",
-                error_message=str(e),
-            )
-        finally:
-            connp.close()
+                    modified_rows = []
+                    for t in modified:
+                        # Update mutable fields on existing record
+                        tx_data = mappers.map_plaid_transaction_to_db_fields(
+                            account_id="",  # account_id immutable here; ignored in update
+                            transaction=t,
+                            account_owner_user_id=user_id,
+                        )
+                        tx_data["external_txn_id"] = getattr(t, "transaction_id", None)
+                        modified_rows.append(tx_data)
+
+                    tx_modified += transaction_repo.apply_transactions_modified_bulk(
+                        connp, rows=modified_rows
+                    )
 
-        next_cursor = next_cursor_out
-        if not last_has_more:
-            break
+                    # Removed: soft-delete by external id, scoped to user
+                    removed_ids = [getattr(r, "transaction_id") for r in removed]
+                    transaction_repo.apply_transaction_removed(
+                        connp, user_id=user_id, external_txn_ids=removed_ids
+                    )
+                    tx_removed += len(removed_ids)
+
+                    # Persist cursor for the item
+                    sync_state_repo.update_sync_cursor(connp, item_db_id, next_cursor_out)
+                    last_has_more = has_more
+                    connp.commit()
+                except Exception as e:
+                    connp.rollback()
+                    logger.error(
+                        json.dumps(
+                            {
+                                "event": "plaid_sync.page_processing_failed",
+                                "item_id": item_external_id,
+                                "page": page,
+                                "error": str(e),
+                            }
+                        )
+                    )
+                    return SyncSummary(
+                        plaid_item_id=item_external_id,
+                        accounts_upserted=accounts_upserted,
+                        tx_added=tx_added,
+                        tx_modified=tx_modified,
+                        tx_removed=tx_removed,
+                        has_more=last_has_more,
+                        error_code="page_processing_failed",
+                        error_message=str(e),
+                    )
+
+            next_cursor = next_cursor_out
+            if not last_has_more:
+                break
+    finally:
+        # A page fetched ahead of a failed write is never read; cancel it if it has
+        # not started and wait for it otherwise, so no Plaid call outlives the sync.
+        if pending_page is not None:
+            pending_page.cancel()
+        prefetch.shutdown(wait=True, cancel_futures=True)
 
     return SyncSummary(
         plaid_item_id=item_external_id,
@@ -247,42 +293,48 @@ async def sync_item(
 async def sync_all_items_for_user(
     *, plaid_client: PlaidClient, user_id: str
 ) -> list[SyncSummary]:
-    """Fetch active items for user and sync each sequentially.
+    """Fetch active items for user and sync them concurrently.
 
-    Kept sequential for simplicity/rate-limits; can be parallelized cautiously.
+    At most SYNC_ITEM_CONCURRENCY items are in flight at once to stay within
+    Plaid rate limits; results keep the order of the items.
     """
-    conn = get_connection()
-    try:
-        plaid_items = plaid_item_repo.list_active_plaid_items_for_user(conn, user_id)
-        items: List[ItemRow] = [
-            ItemRow(id=item.id, user_id=item.user_id, item_id=item.item_id)
-            for item in plaid_items
-        ]
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
-
-    results: list[SyncSummary] = []
-    for item in items:
-        summary = await sync_item(
-            plaid_client=plaid_client,
-            item_db_id=item.id,
-            item_external_id=item.item_id,
-            user_id=user_id,
-        )
-        results.append(summary)
+    with borrow_connection() as conn:
+        try:
+            plaid_items = plaid_item_repo.list_active_plaid_items_for_user(conn, user_id)
+            items: List[ItemRow] = [
+                ItemRow(id=item.id, user_id=item.user_id, item_id=item.item_id)
+                for item in plaid_items
+            ]
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    semaphore = asyncio.Semaphore(SYNC_ITEM_CONCURRENCY)
+
+    async def _sync_one(item: ItemRow) -> SyncSummary:
+        async with semaphore:
+            return await sync_item(
+                plaid_client=plaid_client,
+                item_db_id=item.id,
+                item_external_id=item.item_id,
+                user_id=user_id,
+            )
+
+    results: list[SyncSummary] = list(
+        await asyncio.gather(*(_sync_one(item) for item in items))
+    )
 
-    _categorize_uncategorized_transactions_for_user(user_id=user_id)
+    await _categorize_uncategorized_transactions_for_user(user_id=user_id)
 
     return results
 
 
-def _categorize_uncategorized_transactions_for_user(*, user_id: str) -> None:
+async def _categorize_uncategorized_transactions_for_user(*, user_id: str) -> None:
     try:
-        uncategorized = _fetch_uncategorized_transactions(user_id=user_id)
+        uncategorized = await asyncio.to_thread(
+            _fetch_uncategorized_transactions, user_id=user_id
+        )
     except Exception as e:
         logger.error(
             json.dumps(
@@ -298,12 +350,8 @@ def _categorize_uncategorized_transactions_for_user(*, user_id: str) -> None:
     if not uncategorized:
         return
 
-    updates: dict[str, str] = {}
-    for batch in _batched_transactions(uncategorized, CATEGORIZATION_BATCH_SIZE):
-        if not batch:
-            continue
-
-        request = TransactionCategorizationRequest(
+    requests = [
+        TransactionCategorizationRequest(
             items=[
                 TransactionCategorizationRequestItem(
                     transaction_id=txn.id,
@@ -314,21 +362,24 @@ def _categorize_uncategorized_transactions_for_user(*, user_id: str) -> None:
             ],
             categories=CATEGORIES,
         )
+        for batch in _batched_transactions(uncategorized, CATEGORIZATION_BATCH_SIZE)
+        if batch
+    ]
 
-        try:
-            response = categorize_transactions(request)
-        except Exception as e:
-            logger.error(
-                json.dumps(
-                    {
-                        "event": "plaid_sync.categorization_llm_failed",
-                        "user_id": user_id,
-                        "error": str(e),
-                    }
-                )
+    # Batches are independent prompts, so their LLM calls overlap.
+    try:
+        updates = await categorize_transactions_batch(requests)
+    except Exception as e:
+        logger.error(
+            json.dumps(
+                {
+                    "event": "plaid_sync.categorization_llm_failed",
+                    "user_id": user_id,
+                    "error": str(e),
+                }
             )
-            return
-        updates.update(response or {})
+        )
+        return
 
     if not updates:
         return
@@ -341,7 +392,7 @@ def _categorize_uncategorized_transactions_for_user(*, user_id: str) -> None:
         return
 
     try:
-        _apply_transaction_categories(updates=filtered_updates)
+        await asyncio.to_thread(_apply_transaction_categories, updates=filtered_updates)
     except Exception as e:
         logger.error(
             json.dumps(
@@ -356,45 +407,38 @@ def _categorize_uncategorized_transactions_for_user(*, user_id: str) -> None:
 
 def _fetch_uncategorized_transactions(
     *, user_id: str
-) -> list["transaction_repo.Transaction"]:
-    conn = get_connection()
-    try:
-        transactions = transaction_repo.list_uncategorized_transactions_for_user(
-            conn, user_id=user_id
-        )
-        conn.commit()
-        return transactions
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+) -> list["transaction_repo.TransactionRow"]:
+    with borrow_connection() as conn:
+        try:
+            transactions = transaction_repo.list_uncategorized_transactions_for_user(
+                conn, user_id=user_id
+            )
+            conn.commit()
+            return transactions
+        except Exception:
+            conn.rollback()
+            raise
 
 
 def _apply_transaction_categories(*, updates: dict[str, str]) -> None:
-    conn = get_connection()
-    try:
-        for txn_id, category in updates.items():
-            transaction_repo.update_transaction_category(
-                conn, transaction_id=txn_id, category=category
-            )
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+    with borrow_connection() as conn:
+        try:
+            transaction_repo.update_transaction_categories(conn, categories=updates)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
 
 
 def _batched_transactions(
-    transactions: list["transaction_repo.Transaction"], batch_size: int
+    transactions: list["transaction_repo.TransactionRow"], batch_size: int
 ):
     for index in range(0, len(transactions), batch_size):
         yield transactions[index : index + batch_size]
 
 
 def _build_transaction_description(
-    transaction: "transaction_repo.Transaction",
+    transaction: "transaction_repo.TransactionRow",
 ) -> str:
     description = (transaction.description or "").strip()
     merchant = (transaction.merchant_name or "").strip()
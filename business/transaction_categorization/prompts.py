@@ -1,3 +1,5 @@
+from functools import cache
+
 from business.transaction_categorization.models import (
     TransactionCategorizationRequest,
 )
@@ -19,6 +21,7 @@ CATEGORIES = [
 ]
 
 
+@cache
 def get_system_prompt() -> str:
     categories_str = "\n".join(
         f"{idx + 1}. {cat}" for idx, cat in enumerate(CATEGORIES)
@@ -2,7 +2,7 @@ from business.transaction_categorization.models import (
     TransactionCategorizationRequest,
 )
 from business.transaction_categorization.prompts import get_user_prompt
-from integrations.gemini import llmCallType, textInference
+from integrations.gemini import llmCallType, textInference, textInferenceBatch
 
 
 def categorize_transactions(
@@ -13,3 +13,19 @@ def categorize_transactions(
         call_type=llmCallType.transaction_categorization,
     )
     return {item.transaction_id: item.category for item in response.transactions}
+
+
+async def categorize_transactions_batch(
+    requests: list[TransactionCategorizationRequest],
+) -> dict[str, str]:
+    """Categorize several request batches with concurrent LLM calls; results are merged."""
+    responses = await textInferenceBatch(
+        prompts=[get_user_prompt(request) for request in requests],
+        call_type=llmCallType.transaction_categorization,
+    )
+    categories: dict[str, str] = {}
+    for response in responses:
+        categories.update(
+            {item.transaction_id: item.category for item in response.transactions}
+        )
+    return categories
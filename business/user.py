@@ -2,10 +2,9 @@ import logging
 
 from models.auth_user import AuthUser
 from database.supabase.user import (
+    User,
     get_user_by_idp_id_and_provider,
-    get_user_by_email,
-    create_user,
-    update_user_info,
+    upsert_user,
 )
 
 logger = logging.getLogger(__name__)
@@ -23,13 +22,16 @@ def get_or_create_user_from_auth(auth_user: AuthUser) -> str:
     """
     provider = auth_user.provider or "google"
 
+    # Served from the per-process user cache when warm. A known user whose
+    # profile is unchanged needs no write, so last_login_at only moves when the
+    # row is created or its profile is refreshed.
     existing_user = get_user_by_idp_id_and_provider(auth_user.id, provider)
-
-    if existing_user:
+    if existing_user and not _profile_changed(existing_user, auth_user):
         return existing_user.id
 
-    # Create new user
-    new_user = create_user(
+    # New user or changed profile: create or refresh the row in one round trip
+    # (no insert race between concurrent first logins).
+    user = upsert_user(
         idp_id=auth_user.id,
         email=auth_user.email,
         given_name=auth_user.given_name,
@@ -40,5 +42,22 @@ def get_or_create_user_from_auth(auth_user: AuthUser) -> str:
         provider=provider,
     )
 
-    logger.info(f"Created new user {auth_user.email} with ID: {new_user.id}")
-    return new_user.id
+    logger.debug(f"Upserted user {auth_user.email} with ID: {user.id}")
+    return user.id
+
+
+def _profile_changed(user: User, auth_user: AuthUser) -> bool:
+    """
+    Whether upsert_user() would change the stored profile: a field the identity
+    provider sent differs, or the email became verified. Fields it left out are
+    kept by the upsert, so they never count as changes.
+    """
+    sent = (
+        (auth_user.given_name, user.given_name),
+        (auth_user.family_name, user.family_name),
+        (auth_user.name, user.full_name),
+        (auth_user.picture, user.photo_url),
+    )
+    if any(new is not None and new != old for new, old in sent):
+        return True
+    return bool(auth_user.email_verified) and not user.email_verified
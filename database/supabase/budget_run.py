@@ -2,13 +2,15 @@
 
 import logging
 from datetime import date, datetime
-from decimal import Decimal
-from typing import Any, List, Optional
+from typing import Iterator, List, Optional
+from uuid import uuid4
 
+from psycopg2.extras import Json, execute_values
 from pydantic import BaseModel
 
-from database.supabase.orm import get_connection
-from utils.database import row_to_model_with_cursor
+from database.supabase.orm import borrow_connection
+from utils.database import (construct_model_with_cursor, iter_models_with_cursor,
+                            row_to_models_with_cursor)
 
 logger = logging.getLogger(__name__)
 
@@ -79,53 +81,63 @@ class WeeklyProgress(BaseModel):
 # ============================================================================
 
 
+_SQL_GET_USER_STREAK = "SELECT * FROM user_streaks WHERE user_id = %(user_id)s::uuid"
+
+
 def get_user_streak(user_id: str) -> Optional[UserStreak]:
     """Get the streak record for a user."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
-            "SELECT * FROM user_streaks WHERE user_id = %(user_id)s::uuid",
+            _SQL_GET_USER_STREAK,
             {"user_id": user_id},
         )
         row = cur.fetchone()
-        return row_to_model_with_cursor(row, UserStreak, cur) if row else None
-    finally:
-        cur.close()
-        conn.close()
+        return construct_model_with_cursor(row, UserStreak, cur) if row else None
+
+
+_SQL_CREATE_USER_STREAK = """
+    INSERT INTO user_streaks (user_id)
+    VALUES (%(user_id)s::uuid)
+    ON CONFLICT (user_id) DO NOTHING
+    RETURNING *
+"""
 
 
 def create_user_streak(user_id: str) -> UserStreak:
     """Create a new streak record for a user."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            INSERT INTO user_streaks (user_id)
-            VALUES (%(user_id)s::uuid)
-            ON CONFLICT (user_id) DO NOTHING
-            RETURNING *
-            """,
-            {"user_id": user_id},
-        )
-        row = cur.fetchone()
-        if not row:
-            # Already exists, fetch it
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
             cur.execute(
-                "SELECT * FROM user_streaks WHERE user_id = %(user_id)s::uuid",
+                _SQL_CREATE_USER_STREAK,
                 {"user_id": user_id},
             )
             row = cur.fetchone()
-        conn.commit()
-        return row_to_model_with_cursor(row, UserStreak, cur)
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error creating user streak: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+            if not row:
+                # Already exists, fetch it
+                cur.execute(
+                    _SQL_GET_USER_STREAK,
+                    {"user_id": user_id},
+                )
+                row = cur.fetchone()
+            conn.commit()
+            return construct_model_with_cursor(row, UserStreak, cur)
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error creating user streak: {e}")
+            raise
+
+
+_SQL_UPDATE_USER_STREAK = """
+    UPDATE user_streaks
+    SET current_streak = %(current_streak)s,
+        longest_streak = %(longest_streak)s,
+        streak_start_date = %(streak_start_date)s,
+        last_success_date = %(last_success_date)s,
+        total_successful_days = %(total_successful_days)s,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = %(user_id)s::uuid
+    RETURNING *
+"""
 
 
 def update_user_streak(
@@ -137,40 +149,26 @@ def update_user_streak(
     total_successful_days: int,
 ) -> UserStreak:
     """Update the streak record for a user."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            UPDATE user_streaks
-            SET current_streak = %(current_streak)s,
-                longest_streak = %(longest_streak)s,
-                streak_start_date = %(streak_start_date)s,
-                last_success_date = %(last_success_date)s,
-                total_successful_days = %(total_successful_days)s,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE user_id = %(user_id)s::uuid
-            RETURNING *
-            """,
-            {
-                "user_id": user_id,
-                "current_streak": current_streak,
-                "longest_streak": longest_streak,
-                "streak_start_date": streak_start_date,
-                "last_success_date": last_success_date,
-                "total_successful_days": total_successful_days,
-            },
-        )
-        row = cur.fetchone()
-        conn.commit()
-        return row_to_model_with_cursor(row, UserStreak, cur)
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error updating user streak: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                _SQL_UPDATE_USER_STREAK,
+                {
+                    "user_id": user_id,
+                    "current_streak": current_streak,
+                    "longest_streak": longest_streak,
+                    "streak_start_date": streak_start_date,
+                    "last_success_date": last_success_date,
+                    "total_successful_days": total_successful_days,
+                },
+            )
+            row = cur.fetchone()
+            conn.commit()
+            return construct_model_with_cursor(row, UserStreak, cur)
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error updating user streak: {e}")
+            raise
 
 
 # ============================================================================
@@ -178,23 +176,39 @@ def update_user_streak(
 # ============================================================================
 
 
+_SQL_GET_DAILY_CHALLENGE = """
+    SELECT * FROM daily_challenges
+    WHERE user_id = %(user_id)s::uuid AND challenge_date = %(challenge_date)s
+"""
+
+
 def get_daily_challenge(user_id: str, challenge_date: date) -> Optional[DailyChallenge]:
     """Get a specific daily challenge for a user."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
-            """
-            SELECT * FROM daily_challenges
-            WHERE user_id = %(user_id)s::uuid AND challenge_date = %(challenge_date)s
-            """,
+            _SQL_GET_DAILY_CHALLENGE,
             {"user_id": user_id, "challenge_date": challenge_date},
         )
         row = cur.fetchone()
-        return row_to_model_with_cursor(row, DailyChallenge, cur) if row else None
-    finally:
-        cur.close()
-        conn.close()
+        return construct_model_with_cursor(row, DailyChallenge, cur) if row else None
+
+
+_SQL_CREATE_DAILY_CHALLENGE = """
+    INSERT INTO daily_challenges (
+        user_id, challenge_date, budget_limit, category_filter, challenge_type, description
+    )
+    VALUES (
+        %(user_id)s::uuid, %(challenge_date)s, %(budget_limit)s,
+        %(category_filter)s, %(challenge_type)s, %(description)s
+    )
+    ON CONFLICT (user_id, challenge_date) DO UPDATE SET
+        budget_limit = EXCLUDED.budget_limit,
+        category_filter = EXCLUDED.category_filter,
+        challenge_type = EXCLUDED.challenge_type,
+        description = EXCLUDED.description,
+        updated_at = CURRENT_TIMESTAMP
+    RETURNING *
+"""
 
 
 def create_daily_challenge(
@@ -206,45 +220,37 @@ def create_daily_challenge(
     description: Optional[str] = None,
 ) -> DailyChallenge:
     """Create a new daily challenge for a user."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            INSERT INTO daily_challenges (
-                user_id, challenge_date, budget_limit, category_filter, challenge_type, description
-            )
-            VALUES (
-                %(user_id)s::uuid, %(challenge_date)s, %(budget_limit)s,
-                %(category_filter)s, %(challenge_type)s, %(description)s
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                _SQL_CREATE_DAILY_CHALLENGE,
+                {
+                    "user_id": user_id,
+                    "challenge_date": challenge_date,
+                    "budget_limit": budget_limit,
+                    "category_filter": category_filter,
+                    "challenge_type": challenge_type,
+                    "description": description,
+                },
             )
-            ON CONFLICT (user_id, challenge_date) DO UPDATE SET
-                budget_limit = EXCLUDED.budget_limit,
-                category_filter = EXCLUDED.category_filter,
-                challenge_type = EXCLUDED.challenge_type,
-                description = EXCLUDED.description,
-                updated_at = CURRENT_TIMESTAMP
-            RETURNING *
-            """,
-            {
-                "user_id": user_id,
-                "challenge_date": challenge_date,
-                "budget_limit": budget_limit,
-                "category_filter": category_filter,
-                "challenge_type": challenge_type,
-                "description": description,
-            },
-        )
-        row = cur.fetchone()
-        conn.commit()
-        return row_to_model_with_cursor(row, DailyChallenge, cur)
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error creating daily challenge: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+            row = cur.fetchone()
+            conn.commit()
+            return construct_model_with_cursor(row, DailyChallenge, cur)
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error creating daily challenge: {e}")
+            raise
+
+
+_SQL_COMPLETE_DAILY_CHALLENGE = """
+    UPDATE daily_challenges
+    SET is_completed = %(is_completed)s,
+        actual_spent = %(actual_spent)s,
+        completed_at = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = %(user_id)s::uuid AND challenge_date = %(challenge_date)s
+    RETURNING *
+"""
 
 
 def complete_daily_challenge(
@@ -254,58 +260,43 @@ def complete_daily_challenge(
     is_completed: bool,
 ) -> Optional[DailyChallenge]:
     """Mark a daily challenge as complete with actual spending."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            UPDATE daily_challenges
-            SET is_completed = %(is_completed)s,
-                actual_spent = %(actual_spent)s,
-                completed_at = CURRENT_TIMESTAMP,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE user_id = %(user_id)s::uuid AND challenge_date = %(challenge_date)s
-            RETURNING *
-            """,
-            {
-                "user_id": user_id,
-                "challenge_date": challenge_date,
-                "is_completed": is_completed,
-                "actual_spent": actual_spent,
-            },
-        )
-        row = cur.fetchone()
-        conn.commit()
-        return row_to_model_with_cursor(row, DailyChallenge, cur) if row else None
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error completing daily challenge: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                _SQL_COMPLETE_DAILY_CHALLENGE,
+                {
+                    "user_id": user_id,
+                    "challenge_date": challenge_date,
+                    "is_completed": is_completed,
+                    "actual_spent": actual_spent,
+                },
+            )
+            row = cur.fetchone()
+            conn.commit()
+            return construct_model_with_cursor(row, DailyChallenge, cur) if row else None
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error completing daily challenge: {e}")
+            raise
+
+
+_SQL_LIST_CHALLENGES_FOR_WEEK = """
+    SELECT * FROM daily_challenges
+    WHERE user_id = %(user_id)s::uuid
+      AND challenge_date >= %(week_start)s
+      AND challenge_date < %(week_start)s + INTERVAL '7 days'
+    ORDER BY challenge_date ASC
+"""
 
 
 def list_challenges_for_week(user_id: str, week_start: date) -> List[DailyChallenge]:
     """Get all daily challenges for a given week."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
-            """
-            SELECT * FROM daily_challenges
-            WHERE user_id = %(user_id)s::uuid
-              AND challenge_date >= %(week_start)s
-              AND challenge_date < %(week_start)s + INTERVAL '7 days'
-            ORDER BY challenge_date ASC
-            """,
+            _SQL_LIST_CHALLENGES_FOR_WEEK,
             {"user_id": user_id, "week_start": week_start},
         )
-        rows = cur.fetchall()
-        return [row_to_model_with_cursor(r, DailyChallenge, cur) for r in rows]
-    finally:
-        cur.close()
-        conn.close()
+        return list(iter_models_with_cursor(cur, DailyChallenge))
 
 
 # ============================================================================
@@ -313,24 +304,34 @@ def list_challenges_for_week(user_id: str, week_start: date) -> List[DailyChalle
 # ============================================================================
 
 
-def get_user_badges(user_id: str) -> List[UserBadge]:
-    """Get all badges for a user."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+_SQL_LIST_USER_BADGES = """
+    SELECT * FROM user_badges
+    WHERE user_id = %(user_id)s::uuid
+    ORDER BY earned_at DESC
+"""
+
+
+def iter_user_badges(user_id: str) -> Iterator[UserBadge]:
+    """Stream a user's badges from a server-side cursor, newest first."""
+    with borrow_connection() as conn, conn.cursor(name=f"badges_{uuid4().hex}") as cur:
         cur.execute(
-            """
-            SELECT * FROM user_badges
-            WHERE user_id = %(user_id)s::uuid
-            ORDER BY earned_at DESC
-            """,
+            _SQL_LIST_USER_BADGES,
             {"user_id": user_id},
         )
-        rows = cur.fetchall()
-        return [row_to_model_with_cursor(r, UserBadge, cur) for r in rows]
-    finally:
-        cur.close()
-        conn.close()
+        yield from iter_models_with_cursor(cur, UserBadge)
+
+
+def get_user_badges(user_id: str) -> List[UserBadge]:
+    """Get all badges for a user."""
+    return list(iter_user_badges(user_id))
+
+
+_SQL_AWARD_BADGE = """
+    INSERT INTO user_badges (user_id, badge_type, badge_name, badge_description, badge_icon)
+    VALUES (%(user_id)s::uuid, %(badge_type)s, %(badge_name)s, %(badge_description)s, %(badge_icon)s)
+    ON CONFLICT (user_id, badge_type) DO NOTHING
+    RETURNING *
+"""
 
 
 def award_badge(
@@ -341,52 +342,87 @@ def award_badge(
     badge_icon: Optional[str] = None,
 ) -> Optional[UserBadge]:
     """Award a badge to a user (if they don't already have it)."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            INSERT INTO user_badges (user_id, badge_type, badge_name, badge_description, badge_icon)
-            VALUES (%(user_id)s::uuid, %(badge_type)s, %(badge_name)s, %(badge_description)s, %(badge_icon)s)
-            ON CONFLICT (user_id, badge_type) DO NOTHING
-            RETURNING *
-            """,
-            {
-                "user_id": user_id,
-                "badge_type": badge_type,
-                "badge_name": badge_name,
-                "badge_description": badge_description,
-                "badge_icon": badge_icon,
-            },
-        )
-        row = cur.fetchone()
-        conn.commit()
-        return row_to_model_with_cursor(row, UserBadge, cur) if row else None
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error awarding badge: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                _SQL_AWARD_BADGE,
+                {
+                    "user_id": user_id,
+                    "badge_type": badge_type,
+                    "badge_name": badge_name,
+                    "badge_description": badge_description,
+                    "badge_icon": badge_icon,
+                },
+            )
+            row = cur.fetchone()
+            conn.commit()
+            return construct_model_with_cursor(row, UserBadge, cur) if row else None
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error awarding badge: {e}")
+            raise
+
+
+_SQL_AWARD_BADGES_BULK = """
+    INSERT INTO user_badges (user_id, badge_type, badge_name, badge_description, badge_icon)
+    VALUES %s
+    ON CONFLICT (user_id, badge_type) DO NOTHING
+    RETURNING *
+"""
+
+
+def award_badges_bulk(entries: List[dict]) -> List[UserBadge]:
+    """
+    Award many badges in a single statement.
+
+    Each entry needs user_id, badge_type and badge_name, and may carry
+    badge_description and badge_icon. Badges a user already holds are skipped;
+    only the newly awarded badges are returned.
+    """
+    if not entries:
+        return []
+
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            rows = execute_values(
+                cur,
+                _SQL_AWARD_BADGES_BULK,
+                [
+                    (
+                        e["user_id"],
+                        e["badge_type"],
+                        e["badge_name"],
+                        e.get("badge_description"),
+                        e.get("badge_icon"),
+                    )
+                    for e in entries
+                ],
+                template="(%s::uuid, %s, %s, %s, %s)",
+                page_size=500,
+                fetch=True,
+            )
+            conn.commit()
+            return row_to_models_with_cursor(rows, UserBadge, cur)
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error awarding badges in bulk: {e}")
+            raise
+
+
+_SQL_HAS_BADGE = """
+    SELECT 1 FROM user_badges
+    WHERE user_id = %(user_id)s::uuid AND badge_type = %(badge_type)s
+"""
 
 
 def has_badge(user_id: str, badge_type: str) -> bool:
     """Check if a user has a specific badge."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
-            """
-            SELECT 1 FROM user_badges
-            WHERE user_id = %(user_id)s::uuid AND badge_type = %(badge_type)s
-            """,
+            _SQL_HAS_BADGE,
             {"user_id": user_id, "badge_type": badge_type},
         )
         return cur.fetchone() is not None
-    finally:
-        cur.close()
-        conn.close()
 
 
 # ============================================================================
@@ -394,23 +430,32 @@ def has_badge(user_id: str, badge_type: str) -> bool:
 # ============================================================================
 
 
+_SQL_GET_WEEKLY_PROGRESS = """
+    SELECT * FROM weekly_progress
+    WHERE user_id = %(user_id)s::uuid AND week_start_date = %(week_start)s
+"""
+
+
 def get_weekly_progress(user_id: str, week_start: date) -> Optional[WeeklyProgress]:
     """Get the weekly progress for a user."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
-            """
-            SELECT * FROM weekly_progress
-            WHERE user_id = %(user_id)s::uuid AND week_start_date = %(week_start)s
-            """,
+            _SQL_GET_WEEKLY_PROGRESS,
             {"user_id": user_id, "week_start": week_start},
         )
         row = cur.fetchone()
-        return row_to_model_with_cursor(row, WeeklyProgress, cur) if row else None
-    finally:
-        cur.close()
-        conn.close()
+        return construct_model_with_cursor(row, WeeklyProgress, cur) if row else None
+
+
+_SQL_UPSERT_WEEKLY_PROGRESS = """
+    INSERT INTO weekly_progress (user_id, week_start_date, day_statuses, avatar_position)
+    VALUES (%(user_id)s::uuid, %(week_start)s, %(day_statuses)s, %(avatar_position)s)
+    ON CONFLICT (user_id, week_start_date) DO UPDATE SET
+        day_statuses = EXCLUDED.day_statuses,
+        avatar_position = EXCLUDED.avatar_position,
+        updated_at = CURRENT_TIMESTAMP
+    RETURNING *
+"""
 
 
 def upsert_weekly_progress(
@@ -420,37 +465,24 @@ def upsert_weekly_progress(
     avatar_position: int,
 ) -> WeeklyProgress:
     """Create or update weekly progress for a user."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        import json
-        cur.execute(
-            """
-            INSERT INTO weekly_progress (user_id, week_start_date, day_statuses, avatar_position)
-            VALUES (%(user_id)s::uuid, %(week_start)s, %(day_statuses)s::jsonb, %(avatar_position)s)
-            ON CONFLICT (user_id, week_start_date) DO UPDATE SET
-                day_statuses = EXCLUDED.day_statuses,
-                avatar_position = EXCLUDED.avatar_position,
-                updated_at = CURRENT_TIMESTAMP
-            RETURNING *
-            """,
-            {
-                "user_id": user_id,
-                "week_start": week_start,
-                "day_statuses": json.dumps(day_statuses),
-                "avatar_position": avatar_position,
-            },
-        )
-        row = cur.fetchone()
-        conn.commit()
-        return row_to_model_with_cursor(row, WeeklyProgress, cur)
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error upserting weekly progress: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                _SQL_UPSERT_WEEKLY_PROGRESS,
+                {
+                    "user_id": user_id,
+                    "week_start": week_start,
+                    "day_statuses": Json(day_statuses),
+                    "avatar_position": avatar_position,
+                },
+            )
+            row = cur.fetchone()
+            conn.commit()
+            return construct_model_with_cursor(row, WeeklyProgress, cur)
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error upserting weekly progress: {e}")
+            raise
 
 
 # ============================================================================
@@ -458,61 +490,47 @@ def upsert_weekly_progress(
 # ============================================================================
 
 
+_SQL_GET_DAILY_SPENDING_FOR_CATEGORY = """
+    SELECT COALESCE(SUM(GREATEST(t.amount - t.split_total, 0)), 0)
+    FROM transactions t
+    JOIN accounts a ON t.account_id = a.id
+    WHERE a.user_id = %(user_id)s::uuid
+      AND t.type = 'debit'
+      AND t.pending = FALSE
+      AND t.deleted_at IS NULL
+      AND t.posted_date = %(target_date)s
+      AND LOWER(t.category) = LOWER(%(category)s)
+"""
+
+_SQL_GET_DAILY_SPENDING = """
+    SELECT COALESCE(SUM(GREATEST(t.amount - t.split_total, 0)), 0)
+    FROM transactions t
+    JOIN accounts a ON t.account_id = a.id
+    WHERE a.user_id = %(user_id)s::uuid
+      AND t.type = 'debit'
+      AND t.pending = FALSE
+      AND t.deleted_at IS NULL
+      AND t.posted_date = %(target_date)s
+"""
+
+
 def get_daily_spending(
     user_id: str,
     target_date: date,
     category_filter: Optional[str] = None,
 ) -> float:
     """Get total spending for a user on a specific date."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         if category_filter:
             cur.execute(
-                """
-                WITH split_totals AS (
-                    SELECT transaction_id, SUM(amount) AS total_amount
-                    FROM transaction_splits
-                    WHERE deleted_at IS NULL
-                    GROUP BY transaction_id
-                )
-                SELECT COALESCE(SUM(GREATEST(t.amount - COALESCE(st.total_amount, 0), 0)), 0)
-                FROM transactions t
-                JOIN accounts a ON t.account_id = a.id
-                LEFT JOIN split_totals st ON st.transaction_id = t.id
-                WHERE a.user_id = %(user_id)s::uuid
-                  AND t.type = 'debit'
-                  AND t.pending = FALSE
-                  AND t.deleted_at IS NULL
-                  AND t.posted_date = %(target_date)s
-                  AND LOWER(t.category) = LOWER(%(category)s)
-                """,
+                _SQL_GET_DAILY_SPENDING_FOR_CATEGORY,
                 {"user_id": user_id, "target_date": target_date, "category": category_filter},
             )
         else:
             cur.execute(
-                """
-                WITH split_totals AS (
-                    SELECT transaction_id, SUM(amount) AS total_amount
-                    FROM transaction_splits
-                    WHERE deleted_at IS NULL
-                    GROUP BY transaction_id
-                )
-                SELECT COALESCE(SUM(GREATEST(t.amount - COALESCE(st.total_amount, 0), 0)), 0)
-                FROM transactions t
-                JOIN accounts a ON t.account_id = a.id
-                LEFT JOIN split_totals st ON st.transaction_id = t.id
-                WHERE a.user_id = %(user_id)s::uuid
-                  AND t.type = 'debit'
-                  AND t.pending = FALSE
-                  AND t.deleted_at IS NULL
-                  AND t.posted_date = %(target_date)s
-                """,
+                _SQL_GET_DAILY_SPENDING,
                 {"user_id": user_id, "target_date": target_date},
             )
         result = cur.fetchone()
         return float(result[0]) if result and result[0] else 0.0
-    finally:
-        cur.close()
-        conn.close()
 
@@ -1,11 +1,11 @@
 import logging
 from datetime import datetime
-from typing import List, Literal, Optional, Tuple
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
-from database.supabase.orm import get_connection
-from utils.database import row_to_model_with_cursor
+from database.supabase.orm import borrow_connection
+from utils.database import model_builder
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +22,26 @@ class Friendship(BaseModel):
     deleted_at: Optional[datetime]
 
 
-def _normalize_pair(a: str, b: str) -> Tuple[str, str]:
-    # Ensure deterministic ordering to match PK (user_id, friend_user_id)
-    return (a, b) if str(a) < str(b) else (b, a)
+# Column list in Friendship field order; statements select/return exactly these
+# columns, so rows are built positionally.
+_FRIENDSHIP_FIELDS = tuple(Friendship.model_fields)
+_FRIENDSHIP_COLUMNS = ", ".join(_FRIENDSHIP_FIELDS)
+_build_friendship = model_builder(Friendship, _FRIENDSHIP_FIELDS)
+
+
+# Pairs are stored ordered (user_id < friend_user_id) to match the PK
+_SQL_GET_FRIENDSHIP_ANY = f"""
+    SELECT {_FRIENDSHIP_COLUMNS} FROM friendships
+    WHERE user_id = LEAST(%(a)s::uuid, %(b)s::uuid)
+      AND friend_user_id = GREATEST(%(a)s::uuid, %(b)s::uuid)
+"""
+
+_SQL_GET_FRIENDSHIP = f"""
+    SELECT {_FRIENDSHIP_COLUMNS} FROM friendships
+    WHERE user_id = LEAST(%(a)s::uuid, %(b)s::uuid)
+      AND friend_user_id = GREATEST(%(a)s::uuid, %(b)s::uuid)
+      AND deleted_at IS NULL
+"""
 
 
 def get_friendship(
@@ -33,75 +50,90 @@ def get_friendship(
     *,
     include_deleted: bool = False,
 ) -> Optional[Friendship]:
-    a, b = _normalize_pair(user_id, friend_user_id)
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        sql = "SELECT * FROM friendships WHERE user_id = %(a)s::uuid AND friend_user_id = %(b)s::uuid"
-        if not include_deleted:
-            sql += " AND deleted_at IS NULL"
-        cur.execute(sql, {"a": a, "b": b})
+    with borrow_connection() as conn, conn.cursor() as cur:
+        sql = _SQL_GET_FRIENDSHIP_ANY if include_deleted else _SQL_GET_FRIENDSHIP
+        cur.execute(sql, {"a": user_id, "b": friend_user_id})
         row = cur.fetchone()
-        return row_to_model_with_cursor(row, Friendship, cur) if row else None
-    finally:
-        cur.close()
-        conn.close()
+        return _build_friendship(row) if row else None
+
+
+# One indexed lookup per side of the pair instead of an OR predicate
+_SQL_LIST_ACCEPTED_FRIENDS = f"""
+    SELECT {_FRIENDSHIP_COLUMNS} FROM friendships
+    WHERE user_id = %(uid)s::uuid
+      AND status = 'accepted'
+      AND deleted_at IS NULL
+    UNION ALL
+    SELECT {_FRIENDSHIP_COLUMNS} FROM friendships
+    WHERE friend_user_id = %(uid)s::uuid
+      AND status = 'accepted'
+      AND deleted_at IS NULL
+    ORDER BY created_at DESC
+"""
+
+_SQL_LIST_FRIENDS = f"""
+    SELECT {_FRIENDSHIP_COLUMNS} FROM friendships
+    WHERE user_id = %(uid)s::uuid
+      AND deleted_at IS NULL
+    UNION ALL
+    SELECT {_FRIENDSHIP_COLUMNS} FROM friendships
+    WHERE friend_user_id = %(uid)s::uuid
+      AND deleted_at IS NULL
+    ORDER BY created_at DESC
+"""
 
 
 def list_friends_for_user(
     user_id: str,
     only_accepted: bool = True,
 ) -> List[Friendship]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if only_accepted:
-            cur.execute(
-                """
-                SELECT * FROM friendships
-                WHERE (user_id = %(uid)s::uuid OR friend_user_id = %(uid)s::uuid)
-                  AND status = 'accepted'
-                  AND deleted_at IS NULL
-                ORDER BY created_at DESC
-                """,
-                {"uid": user_id},
-            )
-        else:
-            cur.execute(
-                """
-                SELECT * FROM friendships
-                WHERE (user_id = %(uid)s::uuid OR friend_user_id = %(uid)s::uuid)
-                  AND deleted_at IS NULL
-                ORDER BY created_at DESC
-                """,
-                {"uid": user_id},
-            )
-        rows = cur.fetchall()
-        return [row_to_model_with_cursor(r, Friendship, cur) for r in rows]
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            _SQL_LIST_ACCEPTED_FRIENDS if only_accepted else _SQL_LIST_FRIENDS,
+            {"uid": user_id},
+        )
+        return [_build_friendship(row) for row in cur]
+
+
+_SQL_LIST_FRIENDSHIPS_BY_STATUS = f"""
+    SELECT {_FRIENDSHIP_COLUMNS} FROM friendships
+    WHERE user_id = %(uid)s::uuid
+      AND status = %(status)s
+      AND deleted_at IS NULL
+    UNION ALL
+    SELECT {_FRIENDSHIP_COLUMNS} FROM friendships
+    WHERE friend_user_id = %(uid)s::uuid
+      AND status = %(status)s
+      AND deleted_at IS NULL
+    ORDER BY created_at DESC
+"""
 
 
 def list_friendships_by_status(user_id: str, status: FriendshipStatus) -> List[Friendship]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
-            """
-            SELECT * FROM friendships
-            WHERE (user_id = %(uid)s::uuid OR friend_user_id = %(uid)s::uuid)
-              AND status = %(status)s
-              AND deleted_at IS NULL
-            ORDER BY created_at DESC
-            """,
+            _SQL_LIST_FRIENDSHIPS_BY_STATUS,
             {"uid": user_id, "status": status},
         )
-        rows = cur.fetchall()
-        return [row_to_model_with_cursor(r, Friendship, cur) for r in rows]
-    finally:
-        cur.close()
-        conn.close()
+        return [_build_friendship(row) for row in cur]
+
+
+_SQL_CREATE_FRIENDSHIP = f"""
+    INSERT INTO friendships (user_id, friend_user_id, initiator_user_id, status, created_at, updated_at, deleted_at)
+    VALUES (
+      LEAST(%(a)s::uuid, %(b)s::uuid), GREATEST(%(a)s::uuid, %(b)s::uuid),
+      %(initiator)s::uuid, %(status)s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, NULL
+    )
+    ON CONFLICT (user_id, friend_user_id) DO UPDATE SET
+      status = EXCLUDED.status,
+      updated_at = CURRENT_TIMESTAMP,
+      deleted_at = NULL,
+      initiator_user_id = CASE
+        WHEN friendships.status != 'pending' THEN EXCLUDED.initiator_user_id
+        ELSE friendships.initiator_user_id
+      END
+    RETURNING {_FRIENDSHIP_COLUMNS}
+"""
 
 
 def create_friendship(
@@ -111,44 +143,38 @@ def create_friendship(
     initiator_user_id: str,
     status: FriendshipStatus = "pending",
 ) -> Friendship:
-    a, b = _normalize_pair(user_id, friend_user_id)
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        sql = """
-            INSERT INTO friendships (user_id, friend_user_id, initiator_user_id, status, created_at, updated_at, deleted_at)
-            VALUES (%(a)s::uuid, %(b)s::uuid, %(initiator)s::uuid, %(status)s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, NULL)
-            ON CONFLICT (user_id, friend_user_id) DO UPDATE SET
-              status = EXCLUDED.status,
-              updated_at = CURRENT_TIMESTAMP,
-              deleted_at = NULL,
-              initiator_user_id = CASE
-                WHEN friendships.status != 'pending' THEN EXCLUDED.initiator_user_id
-                ELSE friendships.initiator_user_id
-              END
-            RETURNING *
-        """
-        cur.execute(
-            sql,
-            {
-                "a": a,
-                "b": b,
-                "status": status,
-                "initiator": initiator_user_id,
-            },
-        )
-        row = cur.fetchone()
-        conn.commit()
-        return row_to_model_with_cursor(row, Friendship, cur)
-    except Exception as e:
-        conn.rollback()
-        logger.error(
-            f"Error creating/updating friendship ({user_id},{friend_user_id}): {e}"
-        )
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                _SQL_CREATE_FRIENDSHIP,
+                {
+                    "a": user_id,
+                    "b": friend_user_id,
+                    "status": status,
+                    "initiator": initiator_user_id,
+                },
+            )
+            row = cur.fetchone()
+            conn.commit()
+            return _build_friendship(row)
+        except Exception as e:
+            conn.rollback()
+            logger.error(
+                f"Error creating/updating friendship ({user_id},{friend_user_id}): {e}"
+            )
+            raise
+
+
+_SQL_UPDATE_FRIENDSHIP_STATUS = f"""
+    UPDATE friendships
+    SET status = %(status)s,
+        updated_at = CURRENT_TIMESTAMP,
+        deleted_at = NULL
+    WHERE user_id = LEAST(%(a)s::uuid, %(b)s::uuid)
+      AND friend_user_id = GREATEST(%(a)s::uuid, %(b)s::uuid)
+      AND deleted_at IS NULL
+    RETURNING {_FRIENDSHIP_COLUMNS}
+"""
 
 
 def update_friendship_status(
@@ -156,58 +182,44 @@ def update_friendship_status(
     friend_user_id: str,
     status: FriendshipStatus,
 ) -> Friendship:
-    a, b = _normalize_pair(user_id, friend_user_id)
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            UPDATE friendships
-            SET status = %(status)s,
-                updated_at = CURRENT_TIMESTAMP,
-                deleted_at = NULL
-            WHERE user_id = %(a)s::uuid AND friend_user_id = %(b)s::uuid
-              AND deleted_at IS NULL
-            RETURNING *
-            """,
-            {"status": status, "a": a, "b": b},
-        )
-        row = cur.fetchone()
-        if not row:
-            raise Exception("Friendship not found")
-        conn.commit()
-        return row_to_model_with_cursor(row, Friendship, cur)
-    except Exception as e:
-        conn.rollback()
-        logger.error(
-            f"Error updating friendship status ({user_id},{friend_user_id}) -> {status}: {e}"
-        )
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                _SQL_UPDATE_FRIENDSHIP_STATUS,
+                {"status": status, "a": user_id, "b": friend_user_id},
+            )
+            row = cur.fetchone()
+            if not row:
+                raise Exception("Friendship not found")
+            conn.commit()
+            return _build_friendship(row)
+        except Exception as e:
+            conn.rollback()
+            logger.error(
+                f"Error updating friendship status ({user_id},{friend_user_id}) -> {status}: {e}"
+            )
+            raise
+
+
+_SQL_DELETE_FRIENDSHIP = """
+    UPDATE friendships
+    SET deleted_at = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = LEAST(%(a)s::uuid, %(b)s::uuid)
+      AND friend_user_id = GREATEST(%(a)s::uuid, %(b)s::uuid)
+      AND deleted_at IS NULL
+"""
 
 
 def delete_friendship(user_id: str, friend_user_id: str) -> None:
-    a, b = _normalize_pair(user_id, friend_user_id)
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            UPDATE friendships
-            SET deleted_at = CURRENT_TIMESTAMP,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE user_id = %(a)s::uuid AND friend_user_id = %(b)s::uuid
-              AND deleted_at IS NULL
-            """,
-            {"a": a, "b": b},
-        )
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error deleting friendship ({user_id},{friend_user_id}): {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                _SQL_DELETE_FRIENDSHIP,
+                {"a": user_id, "b": friend_user_id},
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error deleting friendship ({user_id},{friend_user_id}): {e}")
+            raise
@@ -0,0 +1,12 @@
+-- Supporting indexes for friendship and badge listings.
+-- Plain CREATE INDEX (not CONCURRENTLY): migrations run inside one transaction.
+
+-- Second leg of list_friends_for_user / list_friendships_by_status; the first
+-- leg (user_id = ...) is served by the friendships primary key.
+CREATE INDEX IF NOT EXISTS idx_friendships_friend_user_id_active
+  ON friendships (friend_user_id)
+  WHERE deleted_at IS NULL;
+
+-- Lets get_user_badges read badges in ORDER BY earned_at DESC without a sort.
+CREATE INDEX IF NOT EXISTS idx_user_badges_user_earned_at
+  ON user_badges (user_id, earned_at DESC);
@@ -0,0 +1,57 @@
+-- Maintain the live split total on each transaction so spending queries read a
+-- column instead of re-aggregating transaction_splits on every call.
+ALTER TABLE transactions
+  ADD COLUMN IF NOT EXISTS split_total DECIMAL(18,2) NOT NULL DEFAULT 0;
+
+UPDATE transactions t
+SET split_total = st.total_amount
+FROM (
+  SELECT transaction_id, SUM(amount) AS total_amount
+  FROM transaction_splits
+  WHERE deleted_at IS NULL
+  GROUP BY transaction_id
+) st
+WHERE st.transaction_id = t.id
+  AND t.split_total IS DISTINCT FROM st.total_amount;
+
+CREATE OR REPLACE FUNCTION public.refresh_transaction_split_total(txn_id UUID)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  new_total DECIMAL(18,2);
+BEGIN
+  SELECT COALESCE(SUM(amount), 0) INTO new_total
+  FROM transaction_splits
+  WHERE transaction_id = txn_id AND deleted_at IS NULL;
+
+  UPDATE transactions
+  SET split_total = new_total
+  WHERE id = txn_id AND split_total IS DISTINCT FROM new_total;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.sync_transaction_split_total()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF TG_OP <> 'DELETE' THEN
+    PERFORM public.refresh_transaction_split_total(NEW.transaction_id);
+  END IF;
+  IF TG_OP = 'DELETE' THEN
+    PERFORM public.refresh_transaction_split_total(OLD.transaction_id);
+  ELSIF TG_OP = 'UPDATE' THEN
+    IF OLD.transaction_id IS DISTINCT FROM NEW.transaction_id THEN
+      PERFORM public.refresh_transaction_split_total(OLD.transaction_id);
+    END IF;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_transaction_splits_split_total ON transaction_splits;
+CREATE TRIGGER trg_transaction_splits_split_total
+AFTER INSERT OR DELETE OR UPDATE OF amount, deleted_at, transaction_id ON transaction_splits
+FOR EACH ROW
+EXECUTE FUNCTION public.sync_transaction_split_total();
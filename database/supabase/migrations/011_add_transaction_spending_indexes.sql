@@ -0,0 +1,16 @@
+-- Covering / partial indexes for the transaction reads on hot paths.
+-- Plain CREATE INDEX (not CONCURRENTLY): migrations run inside one transaction.
+
+-- Spending aggregates (get_spending_by_category_for_user, get_daily_spending)
+-- only read settled, live debits and only touch these columns, so they can be
+-- answered with index-only scans.
+CREATE INDEX IF NOT EXISTS idx_transactions_settled_debits
+  ON transactions (account_id, posted_date)
+  INCLUDE (amount, split_total, category)
+  WHERE type = 'debit' AND pending = FALSE AND deleted_at IS NULL;
+
+-- list_uncategorized_transactions_for_user after each Plaid sync. Key order
+-- (NULLS LAST included) matches the query's ORDER BY, so no Sort node is needed.
+CREATE INDEX IF NOT EXISTS idx_transactions_uncategorized
+  ON transactions (account_id, posted_date DESC NULLS LAST, authorized_date DESC NULLS LAST, created_at DESC)
+  WHERE (category IS NULL OR category = '') AND deleted_at IS NULL;
@@ -0,0 +1,7 @@
+-- Indexes whose key order matches the ORDER BY of the transaction listings,
+-- so each account's rows come off the index already sorted (no Sort node).
+
+-- iter_transactions_for_user / list_transactions_for_account.
+CREATE INDEX IF NOT EXISTS idx_transactions_account_posted
+  ON transactions (account_id, posted_date DESC NULLS LAST, authorized_date DESC NULLS LAST, created_at DESC)
+  WHERE deleted_at IS NULL;
@@ -0,0 +1,15 @@
+-- Indexes for list_splits_between_users, which reads the two directions of a
+-- payer/debtor pair as separate UNION ALL legs.
+-- Plain CREATE INDEX (not CONCURRENTLY): migrations run inside one transaction.
+
+-- Each leg starts from the payer's live transactions, already in listing order.
+CREATE INDEX IF NOT EXISTS idx_transactions_payer_posted
+  ON transactions (original_payer_user_id, posted_date DESC NULLS LAST, id)
+  INCLUDE (amount, currency, type, description, merchant_name, category, authorized_date)
+  WHERE deleted_at IS NULL;
+
+-- ...and probes the debtor's live splits for those transactions without a heap fetch.
+CREATE INDEX IF NOT EXISTS idx_transaction_splits_debtor_transaction
+  ON transaction_splits (debtor_user_id, transaction_id)
+  INCLUDE (amount, share_weight, note, created_at, updated_at)
+  WHERE deleted_at IS NULL;
@@ -0,0 +1,15 @@
+-- Live-only index for the per-transaction split reads, which all filter
+-- deleted_at IS NULL: soft-deleted splits stay out of the index.
+-- Plain CREATE INDEX (not CONCURRENTLY): migrations run inside one transaction.
+
+-- list_splits_for_transactions / list_splits_with_transactions_for_transactions
+-- (ordered by transaction_id, created_at), sum_splits_for_transactions and the
+-- soft-delete step of replace_transaction_splits. amount is included so the
+-- split sums are index-only.
+CREATE INDEX IF NOT EXISTS idx_transaction_splits_transaction_live
+  ON transaction_splits (transaction_id, created_at)
+  INCLUDE (amount)
+  WHERE deleted_at IS NULL;
+
+-- The debtor side is already covered live-only by
+-- idx_transaction_splits_debtor_transaction (013).
@@ -0,0 +1,4 @@
+-- Conflict target for upsert_user (INSERT ... ON CONFLICT (idp_id, provider)).
+-- idp_id is already unique on its own, so this can never reject existing rows.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_idp_id_provider
+  ON users (idp_id, provider);
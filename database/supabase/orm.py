@@ -1,12 +1,63 @@
 import logging
 import os
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Sequence
 
 import psycopg2
+import psycopg2.extras
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 
-from utils.constants import MIGRATIONS_DIR, SUPABASE_DB_URL
+from utils.constants import (DB_APPLICATION_NAME, DB_POOL_MAX_CONN,
+                             DB_POOL_MIN_CONN, DB_POOL_RECYCLE_SECONDS,
+                             DB_POOL_TIMEOUT_SECONDS, DB_STATEMENT_TIMEOUT_MS,
+                             MIGRATIONS_DIR, SUPABASE_DB_URL)
 
 logger = logging.getLogger(__name__)
 
+# Row models declare amounts as float; decode NUMERIC straight to float so rows
+# can be built with model_construct() without a validation pass.
+DEC2FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values,
+    "DEC2FLOAT",
+    lambda value, cur: float(value) if value is not None else None,
+)
+psycopg2.extensions.register_type(DEC2FLOAT)
+
+# Bind uuid.UUID parameters natively. Only the adapter is registered (not
+# psycopg2.extras.register_uuid()): uuid columns keep decoding to str, which is
+# what the row models declare, so ids never need str() wrapping.
+psycopg2.extensions.register_adapter(uuid.UUID, psycopg2.extras.UUID_adapter)
+
+
+_POOL: Optional[ThreadedConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+# ThreadedConnectionPool.getconn() raises PoolError as soon as every connection is
+# checked out. Holding one slot per checkout makes callers wait for a connection
+# to come back instead; getconn() is only reached when one is guaranteed free.
+_POOL_SLOTS = threading.BoundedSemaphore(DB_POOL_MAX_CONN)
+# When each pooled connection was first handed out, for DB_POOL_RECYCLE_SECONDS.
+_CONN_OPENED_AT: "weakref.WeakKeyDictionary[psycopg2.extensions.connection, float]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Worker threads for parallel(); sized to the pool so every task can hold a connection.
+_PARALLEL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=DB_POOL_MAX_CONN, thread_name_prefix="db-parallel"
+)
+
+# Server-side prepared statements by name. Each connection PREPAREs a statement
+# the first time it runs it; the set of names is tracked per connection object,
+# so discarded connections simply drop out of the map.
+_PREPARED_STATEMENTS: dict[str, str] = {}
+_PREPARED_ON: "weakref.WeakKeyDictionary[psycopg2.extensions.connection, set[str]]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 def get_connection() -> psycopg2.extensions.connection:
     if not SUPABASE_DB_URL:
@@ -14,31 +65,197 @@ def get_connection() -> psycopg2.extensions.connection:
     return psycopg2.connect(SUPABASE_DB_URL)
 
 
+def _get_pool() -> ThreadedConnectionPool:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                if not SUPABASE_DB_URL:
+                    raise RuntimeError("SUPABASE_DB_URL environment variable not set")
+                # Pooled connections live long; TCP keepalives stop idle ones
+                # being silently dropped by NATs/proxies and re-handshaked.
+                # Session settings go in the startup packet via options, so a new
+                # connection needs no SET round trips before its first query.
+                _POOL = ThreadedConnectionPool(
+                    DB_POOL_MIN_CONN,
+                    DB_POOL_MAX_CONN,
+                    SUPABASE_DB_URL,
+                    application_name=DB_APPLICATION_NAME,
+                    options=f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}",
+                    keepalives=1,
+                    keepalives_idle=30,
+                    keepalives_interval=10,
+                    keepalives_count=5,
+                )
+    return _POOL
+
+
+def _checkout(pool: ThreadedConnectionPool) -> psycopg2.extensions.connection:
+    """
+    Take a connection from the pool, replacing it if it has outlived the recycle age.
+
+    The caller must hold a _POOL_SLOTS slot. A recycled connection is closed and
+    replaced under the same slot, so the swap never competes for capacity.
+    """
+    conn = pool.getconn()
+    now = time.monotonic()
+    opened_at = _CONN_OPENED_AT.setdefault(conn, now)
+    if now - opened_at > DB_POOL_RECYCLE_SECONDS:
+        pool.putconn(conn, close=True)
+        conn = pool.getconn()
+        _CONN_OPENED_AT[conn] = now
+    return conn
+
+
+@contextmanager
+def borrow_connection(autocommit: bool = False) -> Iterator[psycopg2.extensions.connection]:
+    """
+    Check a connection out of the process-wide pool for the duration of the block.
+
+    Blocks for up to DB_POOL_TIMEOUT_SECONDS while every pooled connection is in
+    use, then raises PoolError.
+
+    Callers commit their own writes. Anything left uncommitted is rolled back before
+    the connection goes back to the pool, and broken connections are discarded.
+
+    With autocommit=True each statement commits on its own, so a single-statement
+    write needs no separate COMMIT round trip; the flag is reset before the
+    connection is returned.
+    """
+    pool = _get_pool()
+    if not _POOL_SLOTS.acquire(timeout=DB_POOL_TIMEOUT_SECONDS):
+        raise PoolError(
+            f"no database connection became free within {DB_POOL_TIMEOUT_SECONDS}s "
+            f"(all {DB_POOL_MAX_CONN} pooled connections are checked out)"
+        )
+    try:
+        conn = _checkout(pool)
+    except BaseException:
+        _POOL_SLOTS.release()
+        raise
+    try:
+        if autocommit:
+            conn.autocommit = True
+        yield conn
+    finally:
+        discard = bool(conn.closed)
+        if not discard:
+            try:
+                if autocommit:
+                    conn.autocommit = False
+                if (
+                    conn.get_transaction_status()
+                    != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+                ):
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+        try:
+            pool.putconn(conn, close=discard)
+        finally:
+            _POOL_SLOTS.release()
+
+
+def parallel(*calls: Callable[[], Any]) -> list[Any]:
+    """
+    Run independent read-only lookups concurrently and return their results in order.
+
+    Each call runs on a worker thread and acquires its own connection, so wall time
+    is roughly the slowest lookup rather than the sum. The first exception raised by
+    a call is re-raised. Calls must not themselves use parallel().
+    """
+    futures = [_PARALLEL_EXECUTOR.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+
+def prepare_statement(name: str, sql: str) -> str:
+    """Register a statement (using $1..$n parameters) for execute_prepared()."""
+    _PREPARED_STATEMENTS[name] = sql
+    return name
+
+
+def execute_prepared(
+    cur: psycopg2.extensions.cursor, name: str, params: Sequence[Any] = ()
+) -> None:
+    """EXECUTE a registered statement, preparing it on this connection if needed."""
+    prepared = _PREPARED_ON.setdefault(cur.connection, set())
+    if name not in prepared:
+        cur.execute(f"PREPARE {name} AS {_PREPARED_STATEMENTS[name]}")
+        prepared.add(name)
+    if params:
+        placeholders = ", ".join(["%s"] * len(params))
+        cur.execute(f"EXECUTE {name}({placeholders})", tuple(params))
+    else:
+        cur.execute(f"EXECUTE {name}")
+
+
+def _read_file(path: str) -> str:
+    with open(path, "r") as f:
+        return f.read()
+
+
 def run_migrations() -> None:
     logger.info("Starting database migrations...")
-    conn = get_connection()
-    cur = conn.cursor()
 
     migration_files = sorted(
-        [f for f in os.listdir(MIGRATIONS_DIR) if f.endswith(".sql")]
+        entry.name
+        for entry in os.scandir(MIGRATIONS_DIR)
+        if entry.is_file() and entry.name.endswith(".sql")
     )
 
     if not migration_files:
         logger.info("No migration files found.")
         return
 
-    for filename in migration_files:
-        logger.info(f"Executing migration: {filename}")
-        with open(os.path.join(MIGRATIONS_DIR, filename), "r") as f:
-            sql_code = f.read()
-            try:
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+              filename TEXT PRIMARY KEY,
+              applied_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        cur.execute("SELECT filename FROM schema_migrations")
+        applied = {row[0] for row in cur.fetchall()}
+        conn.commit()
+
+        pending = [f for f in migration_files if f not in applied]
+        if not pending:
+            logger.info("No pending migrations.")
+            return
+
+        with ThreadPoolExecutor() as executor:
+            contents = list(
+                executor.map(
+                    _read_file, [os.path.join(MIGRATIONS_DIR, f) for f in pending]
+                )
+            )
+
+        # Apply every pending file in a single transaction: one commit, and a
+        # failure leaves the schema exactly as it was before this run. Files are
+        # therefore run inside BEGIN ... COMMIT, so CREATE INDEX CONCURRENTLY is
+        # not available to them.
+        filename = None
+        try:
+            for filename, sql_code in zip(pending, contents):
+                logger.info(f"Executing migration: {filename}")
                 cur.execute(sql_code)
-                conn.commit()
-                logger.info(f"✓ Successfully executed migration: {filename}")
-            except Exception as e:
-                conn.rollback()
-                logger.error(f"✗ Migration {filename} failed: {e}")
-
-    cur.close()
-    conn.close()
+            filename = None
+            cur.execute(
+                "INSERT INTO schema_migrations (filename) SELECT unnest(%(filenames)s::text[])",
+                {"filenames": pending},
+            )
+            conn.commit()
+            logger.info(f"✓ Successfully executed {len(pending)} migration(s)")
+        except Exception as e:
+            conn.rollback()
+            logger.error(
+                f"✗ Migration {filename or 'bookkeeping'} failed, no migrations applied: {e}"
+            )
+    finally:
+        cur.close()
+        conn.close()
     logger.info("Finished executing migrations.")
@@ -1,10 +1,12 @@
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+from psycopg2.extras import execute_values
 from pydantic import BaseModel
-from database.supabase.orm import get_connection
-from utils.database import row_to_model_with_cursor
+from database.supabase.orm import (borrow_connection, execute_prepared,
+                                   prepare_statement)
+from utils.database import model_builder
 from psycopg2.extensions import connection as PGConnection
 
 logger = logging.getLogger(__name__)
@@ -23,66 +25,116 @@ class PlaidItem(BaseModel):
     deleted_at: Optional[datetime]
 
 
+# Column list in PlaidItem field order; avoids shipping columns the model ignores.
+# Every statement below selects/returns exactly these columns, so rows are built
+# positionally without consulting cursor.description.
+_PLAID_ITEM_FIELDS = tuple(PlaidItem.model_fields)
+_PLAID_ITEM_COLUMNS = ", ".join(_PLAID_ITEM_FIELDS)
+_build_plaid_item = model_builder(PlaidItem, _PLAID_ITEM_FIELDS)
+
+_STMT_GET_PLAID_ITEM_BY_ID = prepare_statement(
+    "get_plaid_item_by_id",
+    f"SELECT {_PLAID_ITEM_COLUMNS} FROM plaid_items WHERE id = $1::uuid",
+)
+_STMT_GET_PLAID_ITEM_BY_USER_AND_ITEM = prepare_statement(
+    "get_plaid_item_by_user_and_item",
+    f"SELECT {_PLAID_ITEM_COLUMNS} FROM plaid_items WHERE user_id = $1::uuid AND item_id = $2",
+)
+# Every Plaid API call starts with this; only the token column is needed.
+_STMT_GET_PLAID_ITEM_ACCESS_TOKEN = prepare_statement(
+    "get_plaid_item_access_token",
+    "SELECT access_token FROM plaid_items WHERE user_id = $1::uuid AND item_id = $2",
+)
+
+
 def get_plaid_item_by_id(item_pk: str) -> Optional[PlaidItem]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "SELECT * FROM plaid_items WHERE id = %(id)s::uuid",
-            {"id": item_pk},
-        )
+    with borrow_connection() as conn, conn.cursor() as cur:
+        execute_prepared(cur, _STMT_GET_PLAID_ITEM_BY_ID, (item_pk,))
         row = cur.fetchone()
-        return row_to_model_with_cursor(row, PlaidItem, cur) if row else None
-    finally:
-        cur.close()
-        conn.close()
+        return _build_plaid_item(row) if row else None
 
 
 def get_plaid_item_by_user_and_item(user_id: str, item_id: str) -> Optional[PlaidItem]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "SELECT * FROM plaid_items WHERE user_id = %(user_id)s::uuid AND item_id = %(item_id)s",
-            {"user_id": user_id, "item_id": item_id},
-        )
+    with borrow_connection() as conn, conn.cursor() as cur:
+        execute_prepared(cur, _STMT_GET_PLAID_ITEM_BY_USER_AND_ITEM, (user_id, item_id))
+        row = cur.fetchone()
+        return _build_plaid_item(row) if row else None
+
+
+def get_plaid_item_access_token(user_id: str, item_id: str) -> Optional[str]:
+    """Encrypted access token of the user's item, or None if there is no such item."""
+    with borrow_connection() as conn, conn.cursor() as cur:
+        execute_prepared(cur, _STMT_GET_PLAID_ITEM_ACCESS_TOKEN, (user_id, item_id))
         row = cur.fetchone()
-        return row_to_model_with_cursor(row, PlaidItem, cur) if row else None
-    finally:
-        cur.close()
-        conn.close()
+        return row[0] if row else None
+
+
+_SQL_GET_PLAID_ITEM_ACCESS_TOKENS = """
+    SELECT item_id, access_token
+    FROM plaid_items
+    WHERE user_id = %s::uuid
+      AND item_id = ANY(%s::text[])
+      AND is_active = TRUE
+"""
+
+
+def get_plaid_item_access_tokens(user_id: str, item_ids: Iterable[str]) -> Dict[str, str]:
+    """Encrypted access tokens of the user's active items, by item_id, in one query.
+
+    Items that do not exist, are inactive or belong to someone else are absent.
+    """
+    ids = list(dict.fromkeys(item_ids))
+    if not ids:
+        return {}
+    with borrow_connection() as conn, conn.cursor() as cur:
+        cur.execute(_SQL_GET_PLAID_ITEM_ACCESS_TOKENS, (user_id, ids))
+        return dict(cur.fetchall())
+
+
+_SQL_LIST_PLAID_ITEMS_FOR_USER = f"""
+    SELECT {_PLAID_ITEM_COLUMNS}
+    FROM plaid_items
+    WHERE user_id = %s::uuid
+    ORDER BY created_at DESC
+"""
 
 
 def list_plaid_items_for_user(user_id: str) -> List[PlaidItem]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "SELECT * FROM plaid_items WHERE user_id = %(user_id)s::uuid ORDER BY created_at DESC",
-            {"user_id": user_id},
-        )
-        rows = cur.fetchall()
-        return [row_to_model_with_cursor(r, PlaidItem, cur) for r in rows]
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        cur.execute(_SQL_LIST_PLAID_ITEMS_FOR_USER, (user_id,))
+        return [_build_plaid_item(row) for row in cur]
+
+
+_SQL_LIST_ACTIVE_PLAID_ITEMS_FOR_USER = f"""
+    SELECT {_PLAID_ITEM_COLUMNS}
+    FROM plaid_items
+    WHERE user_id = %s::uuid
+      AND is_active = TRUE
+    ORDER BY created_at DESC
+"""
 
 
 def list_active_plaid_items_for_user(conn: PGConnection, user_id: str) -> List[PlaidItem]:
     """Return active Plaid items for a user using an existing connection."""
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT *
-        FROM plaid_items
-        WHERE user_id = %(user_id)s::uuid
-          AND is_active = TRUE
-        ORDER BY created_at DESC
-        """,
-        {"user_id": user_id},
-    )
-    rows = cur.fetchall()
-    return [row_to_model_with_cursor(r, PlaidItem, cur) for r in rows]
+    with conn.cursor() as cur:
+        cur.execute(_SQL_LIST_ACTIVE_PLAID_ITEMS_FOR_USER, (user_id,))
+        return [_build_plaid_item(row) for row in cur]
+
+
+_SQL_UPSERT_PLAID_ITEM_CONFLICT = f"""
+    ON CONFLICT (user_id, item_id) DO UPDATE SET
+        access_token = EXCLUDED.access_token,
+        institution_id = EXCLUDED.institution_id,
+        institution_name = EXCLUDED.institution_name,
+        is_active = EXCLUDED.is_active,
+        updated_at = CURRENT_TIMESTAMP,
+        deleted_at = NULL
+    RETURNING {_PLAID_ITEM_COLUMNS}
+"""
+_SQL_UPSERT_PLAID_ITEM = """
+    INSERT INTO plaid_items (user_id, access_token, item_id, institution_id, institution_name, is_active)
+    VALUES (%s::uuid, %s, %s, %s, %s, %s)
+""" + _SQL_UPSERT_PLAID_ITEM_CONFLICT
 
 
 def create_or_update_plaid_item(
@@ -93,59 +145,73 @@ def create_or_update_plaid_item(
     institution_name: Optional[str],
     is_active: bool = True,
 ) -> PlaidItem:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        sql = """
-            INSERT INTO plaid_items (user_id, access_token, item_id, institution_id, institution_name, is_active)
-            VALUES (%(user_id)s::uuid, %(access_token)s, %(item_id)s, %(institution_id)s, %(institution_name)s, %(is_active)s)
-            ON CONFLICT (user_id, item_id) DO UPDATE SET
-                access_token = EXCLUDED.access_token,
-                institution_id = EXCLUDED.institution_id,
-                institution_name = EXCLUDED.institution_name,
-                is_active = EXCLUDED.is_active,
-                updated_at = CURRENT_TIMESTAMP,
-                deleted_at = NULL
-            RETURNING *
-        """
-        params = {
-            "user_id": user_id,
-            "access_token": access_token,
-            "item_id": item_id,
-            "institution_id": institution_id,
-            "institution_name": institution_name,
-            "is_active": is_active,
-        }
-        cur.execute(sql, params)
-        row = cur.fetchone()
-        conn.commit()
-        return row_to_model_with_cursor(row, PlaidItem, cur)
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error upserting plaid_item (user_id={user_id}, item_id={item_id}): {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                _SQL_UPSERT_PLAID_ITEM,
+                (user_id, access_token, item_id, institution_id, institution_name, is_active),
+            )
+            row = cur.fetchone()
+            conn.commit()
+            return _build_plaid_item(row)
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error upserting plaid_item (user_id={user_id}, item_id={item_id}): {e}")
+            raise
+
+
+_SQL_UPSERT_PLAID_ITEMS = """
+    INSERT INTO plaid_items (user_id, access_token, item_id, institution_id, institution_name, is_active)
+    VALUES %s
+""" + _SQL_UPSERT_PLAID_ITEM_CONFLICT
+
+
+def create_or_update_plaid_items(
+    user_id: str,
+    items: Sequence[Tuple[str, str, Optional[str], Optional[str]]],
+    is_active: bool = True,
+) -> List[PlaidItem]:
+    """
+    Upsert several of the user's items in one statement and one commit.
+
+    items are (access_token, item_id, institution_id, institution_name) tuples; a
+    repeated item_id keeps its last entry, since one INSERT cannot touch a row twice.
+    """
+    by_item_id = {item[1]: item for item in items}
+    if not by_item_id:
+        return []
+    values = [(user_id, *item, is_active) for item in by_item_id.values()]
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            rows = execute_values(
+                cur,
+                _SQL_UPSERT_PLAID_ITEMS,
+                values,
+                template="(%s::uuid, %s, %s, %s, %s, %s::boolean)",
+                page_size=100,
+                fetch=True,
+            )
+            conn.commit()
+            return [_build_plaid_item(row) for row in rows]
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error upserting {len(values)} plaid_items (user_id={user_id}): {e}")
+            raise
+
+
+_SQL_DEACTIVATE_PLAID_ITEM = """
+    UPDATE plaid_items
+    SET is_active = FALSE, deleted_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+    WHERE id = %s::uuid
+"""
 
 
 def deactivate_plaid_item(item_pk: str) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            UPDATE plaid_items
-            SET is_active = FALSE, deleted_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
-            WHERE id = %(id)s::uuid
-            """,
-            {"id": item_pk},
-        )
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error deactivating plaid_item {item_pk}: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute(_SQL_DEACTIVATE_PLAID_ITEM, (item_pk,))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error deactivating plaid_item {item_pk}: {e}")
+            raise
@@ -5,7 +5,7 @@ from typing import Optional
 from psycopg2.extensions import connection as PGConnection
 from pydantic import BaseModel
 
-from utils.database import row_to_model_with_cursor
+from utils.database import construct_model_with_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -31,14 +31,19 @@ def get_or_create_sync_state(conn: PGConnection, plaid_item_id: str) -> PlaidIte
         {"plaid_item_id": plaid_item_id},
     )
     row = cur.fetchone()
-    return row_to_model_with_cursor(row, PlaidItemSyncState, cur)
+    return construct_model_with_cursor(row, PlaidItemSyncState, cur)
 
 
 def update_accounts_last_synced_at(conn: PGConnection, plaid_item_id: str) -> None:
-    """Refresh the accounts_last_synced_at timestamp for the item."""
+    """Refresh the accounts_last_synced_at timestamp for the item.
+
+    Relaxes synchronous_commit for the enclosing transaction: it only holds data
+    mirrored from Plaid, which the next sync re-fetches if a crash loses it.
+    """
     cur = conn.cursor()
     cur.execute(
         """
+        SET LOCAL synchronous_commit = off;
         UPDATE plaid_item_sync_state
         SET accounts_last_synced_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
         WHERE plaid_item_id = %(plaid_item_id)s::uuid
@@ -48,10 +53,15 @@ def update_accounts_last_synced_at(conn: PGConnection, plaid_item_id: str) -> No
 
 
 def update_sync_cursor(conn: PGConnection, plaid_item_id: str, next_cursor: Optional[str]) -> None:
-    """Store the latest Plaid transactions cursor for the item."""
+    """Store the latest Plaid transactions cursor for the item.
+
+    Relaxes synchronous_commit for the enclosing transaction: the cursor commits
+    atomically with the page it covers, so a lost commit just replays that page.
+    """
     cur = conn.cursor()
     cur.execute(
         """
+        SET LOCAL synchronous_commit = off;
         UPDATE plaid_item_sync_state
         SET transactions_cursor = %(cursor)s, updated_at = CURRENT_TIMESTAMP
         WHERE plaid_item_id = %(plaid_item_id)s::uuid
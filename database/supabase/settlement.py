@@ -4,8 +4,8 @@ from typing import Optional, List
  
 
 from pydantic import BaseModel
-from database.supabase.orm import get_connection
-from utils.database import row_to_model_with_cursor
+from database.supabase.orm import borrow_connection
+from utils.database import construct_model_with_cursor, row_to_models_with_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -21,28 +21,27 @@ class Settlement(BaseModel):
     created_at: datetime
 
 
+# Column list in Settlement field order; avoids shipping columns the model ignores.
+_SETTLEMENT_COLUMNS = (
+    "id, from_user_id, to_user_id, amount, currency, method, related_txn_id, created_at"
+)
+
+
 def get_settlement_by_id(sid: str) -> Optional[Settlement]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
-            "SELECT * FROM settlements WHERE id = %(id)s::uuid",
-            {"id": sid},
+            f"SELECT {_SETTLEMENT_COLUMNS} FROM settlements WHERE id = %s::uuid",
+            (sid,),
         )
         row = cur.fetchone()
-        return row_to_model_with_cursor(row, Settlement, cur) if row else None
-    finally:
-        cur.close()
-        conn.close()
+        return construct_model_with_cursor(row, Settlement, cur) if row else None
 
 
 def list_settlements_between_users(a: str, b: str) -> List[Settlement]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
-            """
-            SELECT * FROM settlements
+            f"""
+            SELECT {_SETTLEMENT_COLUMNS} FROM settlements
             WHERE (from_user_id = %(a)s::uuid AND to_user_id = %(b)s::uuid)
                OR (from_user_id = %(b)s::uuid AND to_user_id = %(a)s::uuid)
             ORDER BY created_at DESC
@@ -50,10 +49,7 @@ def list_settlements_between_users(a: str, b: str) -> List[Settlement]:
             {"a": a, "b": b},
         )
         rows = cur.fetchall()
-        return [row_to_model_with_cursor(r, Settlement, cur) for r in rows]
-    finally:
-        cur.close()
-        conn.close()
+        return row_to_models_with_cursor(rows, Settlement, cur)
 
 
 def create_settlement(
@@ -64,32 +60,28 @@ def create_settlement(
     method: Optional[str],
     related_txn_id: Optional[str] = None,
 ) -> Settlement:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        sql = """
-            INSERT INTO settlements (from_user_id, to_user_id, amount, currency, method, related_txn_id)
-            VALUES (%(from_user_id)s, %(to_user_id)s, %(amount)s, %(currency)s, %(method)s, %(related_txn_id)s)
-            RETURNING *
-        """
-        params = {
-            "from_user_id": from_user_id,
-            "to_user_id": to_user_id,
-            "amount": amount,
-            "currency": currency,
-            "method": method,
-            "related_txn_id": related_txn_id,
-        }
-        cur.execute(sql, params)
-        row = cur.fetchone()
-        conn.commit()
-        return row_to_model_with_cursor(row, Settlement, cur)
-    except Exception as e:
-        conn.rollback()
-        logger.error(
-            f"Error creating settlement {from_user_id}->{to_user_id} amount={amount}: {e}"
-        )
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            sql = f"""
+                INSERT INTO settlements (from_user_id, to_user_id, amount, currency, method, related_txn_id)
+                VALUES (%(from_user_id)s, %(to_user_id)s, %(amount)s, %(currency)s, %(method)s, %(related_txn_id)s)
+                RETURNING {_SETTLEMENT_COLUMNS}
+            """
+            params = {
+                "from_user_id": from_user_id,
+                "to_user_id": to_user_id,
+                "amount": amount,
+                "currency": currency,
+                "method": method,
+                "related_txn_id": related_txn_id,
+            }
+            cur.execute(sql, params)
+            row = cur.fetchone()
+            conn.commit()
+            return construct_model_with_cursor(row, Settlement, cur)
+        except Exception as e:
+            conn.rollback()
+            logger.error(
+                f"Error creating settlement {from_user_id}->{to_user_id} amount={amount}: {e}"
+            )
+            raise
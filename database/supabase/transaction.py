@@ -1,15 +1,22 @@
 import logging
+from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Any, Iterable, List, Optional, Tuple
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from uuid import uuid4
 
 from psycopg2.extensions import connection as PGConnection
+from psycopg2.extras import execute_batch, execute_values
 from pydantic import BaseModel
 
-from database.supabase.orm import get_connection
-from utils.database import row_to_model_with_cursor
+from database.supabase.orm import (borrow_connection, execute_prepared,
+                                   prepare_statement)
+from utils.database import copy_csv_buffer, model_builder
 
 logger = logging.getLogger(__name__)
 
+# Rows pulled per round trip when scanning transaction history server-side.
+SCAN_BATCH_SIZE = 1000
+
 
 class Transaction(BaseModel):
     id: str
@@ -26,44 +33,114 @@ class Transaction(BaseModel):
     pending: bool
     original_payer_user_id: Optional[str]
     created_at: datetime
-    split_total: Optional[float] = None
+    split_total: float = 0.0
     user_amount: Optional[float] = None
     has_split: Optional[bool] = None
 
 
-def list_transactions_for_user(user_id: str) -> List[Transaction]:
-    """Return all transactions for the given user ordered from newest to oldest."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+@dataclass(slots=True, frozen=True)
+class TransactionRow:
+    """Read-only transaction for internal read paths.
+
+    Fields mirror Transaction in select-list order, so rows from the listing
+    queries map onto it positionally with no validation. Convert to a pydantic
+    schema only at the API boundary.
+    """
+
+    id: str
+    account_id: str
+    external_txn_id: Optional[str]
+    amount: float
+    currency: Optional[str]
+    type: str
+    merchant_name: Optional[str]
+    description: Optional[str]
+    category: Optional[str]
+    authorized_date: Optional[date]
+    posted_date: Optional[date]
+    pending: bool
+    original_payer_user_id: Optional[str]
+    created_at: datetime
+    split_total: float = 0.0
+    user_amount: Optional[float] = None
+    has_split: Optional[bool] = None
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "TransactionRow":
+        return cls(*row)
+
+
+# Column lists in Transaction field order; avoids shipping columns the model ignores.
+# Statements selecting/returning exactly these columns build rows positionally.
+_TRANSACTION_FIELDS = (
+    "id",
+    "account_id",
+    "external_txn_id",
+    "amount",
+    "currency",
+    "type",
+    "merchant_name",
+    "description",
+    "category",
+    "authorized_date",
+    "posted_date",
+    "pending",
+    "original_payer_user_id",
+    "created_at",
+    "split_total",
+)
+_TRANSACTION_COLUMNS = ", ".join(_TRANSACTION_FIELDS)
+_TRANSACTION_COLUMNS_T = ", ".join(f"t.{column}" for column in _TRANSACTION_FIELDS)
+_build_transaction = model_builder(Transaction, _TRANSACTION_FIELDS)
+
+_STMT_GET_TRANSACTION_BY_ID = prepare_statement(
+    "get_transaction_by_id",
+    f"SELECT {_TRANSACTION_COLUMNS} FROM transactions WHERE id = $1::uuid",
+)
+_STMT_GET_TRANSACTION_BY_EXTERNAL_ID = prepare_statement(
+    "get_transaction_by_external_id",
+    f"SELECT {_TRANSACTION_COLUMNS} FROM transactions WHERE external_txn_id = $1",
+)
+
+
+def _iter_transaction_rows(cur, batch: int) -> Iterator[TransactionRow]:
+    while True:
+        rows = cur.fetchmany(batch)
+        if not rows:
+            break
+        yield from map(TransactionRow.from_row, rows)
+
+
+def iter_transactions_for_user(
+    user_id: str, *, batch: int = SCAN_BATCH_SIZE
+) -> Iterator[TransactionRow]:
+    """Stream the user's transactions, newest first, from a server-side cursor.
+
+    The pooled connection is held until the iterator is exhausted or closed.
+    """
+    with borrow_connection() as conn, conn.cursor(name=f"txn_scan_{uuid4().hex}") as cur:
         cur.execute(
-            """
-            WITH split_totals AS (
-                SELECT transaction_id, SUM(amount) AS total_amount
-                FROM transaction_splits
-                WHERE deleted_at IS NULL
-                GROUP BY transaction_id
-            )
+            f"""
             SELECT
-                t.*,
-                COALESCE(st.total_amount, 0) AS split_total,
-                GREATEST(t.amount - COALESCE(st.total_amount, 0), 0) AS user_amount,
-                (COALESCE(st.total_amount, 0) > 0) AS has_split
+                {_TRANSACTION_COLUMNS_T},
+                GREATEST(t.amount - t.split_total, 0) AS user_amount,
+                (t.split_total > 0) AS has_split
             FROM transactions t
             JOIN accounts a ON t.account_id = a.id
-            LEFT JOIN split_totals st ON st.transaction_id = t.id
             WHERE a.user_id = %(user_id)s::uuid
               AND t.deleted_at IS NULL
-            ORDER BY COALESCE(t.posted_date, t.authorized_date) DESC NULLS LAST,
+            ORDER BY t.posted_date DESC NULLS LAST,
+                     t.authorized_date DESC NULLS LAST,
                      t.created_at DESC
             """,
             {"user_id": user_id},
         )
-        rows = cur.fetchall()
-        return [row_to_model_with_cursor(r, Transaction, cur) for r in rows]
-    finally:
-        cur.close()
-        conn.close()
+        yield from _iter_transaction_rows(cur, batch)
+
+
+def list_transactions_for_user(user_id: str) -> List[TransactionRow]:
+    """Return all transactions for the given user ordered from newest to oldest."""
+    return list(iter_transactions_for_user(user_id))
 
 
 def get_spending_by_category_for_user(
@@ -73,23 +150,14 @@ def get_spending_by_category_for_user(
     end_date_exclusive: date,
 ) -> List[Tuple[str, float]]:
     """Aggregate debit transactions by category for a user within a date range."""
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
             """
-            WITH split_totals AS (
-                SELECT transaction_id, SUM(amount) AS total_amount
-                FROM transaction_splits
-                WHERE deleted_at IS NULL
-                GROUP BY transaction_id
-            )
             SELECT
                 COALESCE(NULLIF(t.category, ''), 'uncategorized') AS category,
-                SUM(GREATEST(t.amount - COALESCE(st.total_amount, 0), 0)) AS total_amount
+                COALESCE(SUM(GREATEST(t.amount - t.split_total, 0)), 0)::float8 AS total_amount
             FROM transactions t
             JOIN accounts a ON t.account_id = a.id
-            LEFT JOIN split_totals st ON st.transaction_id = t.id
             WHERE a.user_id = %(user_id)s::uuid
               AND t.type = 'debit'
               AND t.pending = FALSE
@@ -105,80 +173,51 @@ def get_spending_by_category_for_user(
                 "end_date": end_date_exclusive,
             },
         )
-        rows = cur.fetchall()
-        results: List[Tuple[str, float]] = []
-        for category, total in rows:
-            total_float = float(total) if total is not None else 0.0
-            results.append((category, total_float))
-        return results
-    finally:
-        cur.close()
-        conn.close()
+        return cur.fetchall()
 
 
 def get_transaction_by_id(txn_id: str) -> Optional[Transaction]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "SELECT * FROM transactions WHERE id = %(id)s::uuid",
-            {"id": txn_id},
-        )
+    with borrow_connection() as conn, conn.cursor() as cur:
+        execute_prepared(cur, _STMT_GET_TRANSACTION_BY_ID, (txn_id,))
         row = cur.fetchone()
-        return row_to_model_with_cursor(row, Transaction, cur) if row else None
-    finally:
-        cur.close()
-        conn.close()
+        return _build_transaction(row) if row else None
 
 
 def get_transaction_by_external_id(external_txn_id: str) -> Optional[Transaction]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "SELECT * FROM transactions WHERE external_txn_id = %(external_txn_id)s",
-            {"external_txn_id": external_txn_id},
-        )
+    with borrow_connection() as conn, conn.cursor() as cur:
+        execute_prepared(cur, _STMT_GET_TRANSACTION_BY_EXTERNAL_ID, (external_txn_id,))
         row = cur.fetchone()
-        return row_to_model_with_cursor(row, Transaction, cur) if row else None
-    finally:
-        cur.close()
-        conn.close()
+        return _build_transaction(row) if row else None
+
+
+_SQL_LIST_TRANSACTIONS_FOR_ACCOUNT = f"""
+    SELECT {_TRANSACTION_COLUMNS} FROM transactions
+    WHERE account_id = %(account_id)s::uuid
+      AND (%(date_from)s::date IS NULL OR posted_date >= %(date_from)s::date)
+      AND (%(date_to)s::date IS NULL OR posted_date <= %(date_to)s::date)
+      AND deleted_at IS NULL
+    ORDER BY posted_date DESC NULLS LAST,
+             authorized_date DESC NULLS LAST,
+             created_at DESC
+"""
 
 
 def list_transactions_for_account(
     account_id: str,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-) -> List[Transaction]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        if date_from and date_to:
-            cur.execute(
-                """
-                SELECT * FROM transactions
-                WHERE account_id = %(account_id)s::uuid
-                  AND posted_date >= %(date_from)s
-                  AND posted_date <= %(date_to)s
-                ORDER BY posted_date DESC, created_at DESC
-                """,
-                {"account_id": account_id, "date_from": date_from, "date_to": date_to},
-            )
-        else:
-            cur.execute(
-                """
-                SELECT * FROM transactions
-                WHERE account_id = %(account_id)s::uuid
-                ORDER BY posted_date DESC NULLS LAST, created_at DESC
-                """,
-                {"account_id": account_id},
-            )
-        rows = cur.fetchall()
-        return [row_to_model_with_cursor(r, Transaction, cur) for r in rows]
-    finally:
-        cur.close()
-        conn.close()
+) -> List[TransactionRow]:
+    """List an account's transactions, optionally bounded by posted_date (inclusive).
+
+    An unset bound is not applied, so rows without a posted_date are only
+    returned when neither bound is given.
+    """
+    with borrow_connection() as conn, conn.cursor(name=f"txn_scan_{uuid4().hex}") as cur:
+        cur.execute(
+            _SQL_LIST_TRANSACTIONS_FOR_ACCOUNT,
+            {"account_id": account_id, "date_from": date_from, "date_to": date_to},
+        )
+        return list(_iter_transaction_rows(cur, SCAN_BATCH_SIZE))
 
 
 def list_uncategorized_transactions_for_user(
@@ -186,18 +225,19 @@ def list_uncategorized_transactions_for_user(
     *,
     user_id: str,
     limit: Optional[int] = None,
-) -> List[Transaction]:
-    cur = conn.cursor()
-    try:
+) -> List[TransactionRow]:
+    with conn.cursor() as cur:
         query = (
-            """
-            SELECT t.*
+            f"""
+            SELECT {_TRANSACTION_COLUMNS_T}
             FROM transactions t
             JOIN accounts a ON t.account_id = a.id
             WHERE a.user_id = %(user_id)s::uuid
               AND (t.category IS NULL OR t.category = '')
               AND t.deleted_at IS NULL
-            ORDER BY t.posted_date DESC NULLS LAST, t.created_at DESC
+            ORDER BY t.posted_date DESC NULLS LAST,
+                     t.authorized_date DESC NULLS LAST,
+                     t.created_at DESC
             """
         )
         params: dict[str, Any] = {"user_id": user_id}
@@ -207,20 +247,21 @@ def list_uncategorized_transactions_for_user(
 
         cur.execute(query, params)
         rows = cur.fetchall()
-        return [row_to_model_with_cursor(r, Transaction, cur) for r in rows]
-    finally:
-        cur.close()
+        return [TransactionRow.from_row(row) for row in rows]
 
 
-def update_transaction_category(
+def update_transaction_categories(
     conn: PGConnection,
     *,
-    transaction_id: str,
-    category: str,
-) -> int:
-    cur = conn.cursor()
-    try:
-        cur.execute(
+    categories: dict[str, str],
+) -> None:
+    """Set the category of many transactions, sending the UPDATEs in pages."""
+    if not categories:
+        return
+
+    with conn.cursor() as cur:
+        execute_batch(
+            cur,
             """
             UPDATE transactions
             SET category = %(category)s,
@@ -228,14 +269,17 @@ def update_transaction_category(
             WHERE id = %(transaction_id)s::uuid
               AND deleted_at IS NULL
             """,
-            {"transaction_id": transaction_id, "category": category},
+            [
+                {"transaction_id": transaction_id, "category": category}
+                for transaction_id, category in categories.items()
+            ],
+            page_size=100,
         )
-        return cur.rowcount
-    finally:
-        cur.close()
 
 
 def upsert_transaction(
+    conn: PGConnection,
+    *,
     account_id: str,
     external_txn_id: Optional[str],
     amount: float,
@@ -249,11 +293,10 @@ def upsert_transaction(
     pending: bool,
     original_payer_user_id: Optional[str],
 ) -> Transaction:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    """Insert or update one transaction via an existing connection; the caller commits."""
+    with conn.cursor() as cur:
         if external_txn_id:
-            sql = """
+            sql = f"""
                 INSERT INTO transactions (
                     account_id, external_txn_id, amount, currency, type, merchant_name, description, category,
                     authorized_date, posted_date, pending, original_payer_user_id
@@ -275,10 +318,10 @@ def upsert_transaction(
                     posted_date = EXCLUDED.posted_date,
                     pending = EXCLUDED.pending,
                     original_payer_user_id = EXCLUDED.original_payer_user_id
-                RETURNING *
+                RETURNING {_TRANSACTION_COLUMNS}
             """
         else:
-            sql = """
+            sql = f"""
                 INSERT INTO transactions (
                     account_id, amount, currency, type, merchant_name, description, category,
                     authorized_date, posted_date, pending, original_payer_user_id
@@ -287,7 +330,7 @@ def upsert_transaction(
                     %(account_id)s::uuid, %(amount)s, %(currency)s, %(type)s, %(merchant_name)s, %(description)s,
                     %(category)s, %(authorized_date)s, %(posted_date)s, %(pending)s, %(original_payer_user_id)s::uuid
                 )
-                RETURNING *
+                RETURNING {_TRANSACTION_COLUMNS}
             """
 
         params = {
@@ -307,31 +350,28 @@ def upsert_transaction(
 
         cur.execute(sql, params)
         row = cur.fetchone()
-        conn.commit()
-        return row_to_model_with_cursor(row, Transaction, cur)
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error upserting transaction (external={external_txn_id}): {e}")
-        raise
-    finally:
-       cur.close()
-       conn.close()
-
-
-def upsert_transaction_added(conn: PGConnection, *, data: dict[str, Any]) -> None:
-    """Upsert (or undelete) a Plaid-added transaction using an existing connection."""
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO transactions (
-            account_id, external_txn_id, amount, currency, type, merchant_name, description, category,
-            authorized_date, posted_date, pending, original_payer_user_id
-        )
-        VALUES (
-            %(account_id)s::uuid, %(external_txn_id)s, %(amount)s, %(currency)s, %(type)s, %(merchant_name)s,
-            %(description)s, %(category)s, %(authorized_date)s, %(posted_date)s, %(pending)s,
-            %(original_payer_user_id)s::uuid
-        )
+        return _build_transaction(row)
+
+
+# Plaid sync helpers below run on the caller's connection and never commit: the
+# sync loop commits (or rolls back) once per page, so a page is one transaction.
+_TRANSACTION_BULK_COLUMNS = (
+    "plaid_account_id",
+    "external_txn_id",
+    "amount",
+    "currency",
+    "type",
+    "merchant_name",
+    "description",
+    "category",
+    "authorized_date",
+    "posted_date",
+    "pending",
+    "original_payer_user_id",
+)
+
+
+_SQL_ADDED_TRANSACTIONS_CONFLICT = """
         ON CONFLICT (external_txn_id) DO UPDATE SET
             account_id = EXCLUDED.account_id,
             amount = EXCLUDED.amount,
@@ -346,31 +386,212 @@ def upsert_transaction_added(conn: PGConnection, *, data: dict[str, Any]) -> Non
             original_payer_user_id = EXCLUDED.original_payer_user_id,
             updated_at = CURRENT_TIMESTAMP,
             deleted_at = NULL
-        """,
-        data,
+        RETURNING id
+"""
+
+_SQL_CREATE_ADDED_TRANSACTIONS_STAGE = """
+    CREATE TEMP TABLE IF NOT EXISTS added_transactions_stage (
+        plaid_account_id TEXT,
+        external_txn_id TEXT,
+        amount NUMERIC,
+        currency TEXT,
+        type TEXT,
+        merchant_name TEXT,
+        description TEXT,
+        category TEXT,
+        authorized_date DATE,
+        posted_date DATE,
+        pending BOOLEAN,
+        original_payer_user_id UUID
+    ) ON COMMIT DROP;
+    TRUNCATE added_transactions_stage;
+"""
+
+# Batches larger than this are loaded with COPY into a staging table instead of
+# a multi-VALUES INSERT (historic imports/backfills).
+COPY_THRESHOLD = 1000
+
+
+def _upsert_transactions_added_copy(
+    conn: PGConnection,
+    *,
+    user_id: str,
+    plaid_item_id: str,
+    rows: list[dict[str, Any]],
+) -> int:
+    buf = copy_csv_buffer(
+        [row[column] for column in _TRANSACTION_BULK_COLUMNS] for row in rows
     )
 
+    with conn.cursor() as cur:
+        cur.execute(_SQL_CREATE_ADDED_TRANSACTIONS_STAGE)
+        cur.copy_expert(
+            f"COPY added_transactions_stage ({', '.join(_TRANSACTION_BULK_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+        # Temp tables are never auto-analyzed; without stats the planner guesses
+        # the stage size when choosing how to join it against accounts.
+        cur.execute("ANALYZE added_transactions_stage")
+        cur.execute(
+            """
+            INSERT INTO transactions (
+                account_id, external_txn_id, amount, currency, type, merchant_name, description, category,
+                authorized_date, posted_date, pending, original_payer_user_id
+            )
+            SELECT
+                a.id, v.external_txn_id, v.amount, v.currency, v.type, v.merchant_name, v.description,
+                v.category, v.authorized_date, v.posted_date, v.pending, v.original_payer_user_id
+            FROM added_transactions_stage v
+            JOIN accounts a
+              ON a.plaid_account_id = v.plaid_account_id
+             AND a.user_id = %(user_id)s::uuid
+             AND a.plaid_item_id = %(plaid_item_id)s::uuid
+            """
+            + _SQL_ADDED_TRANSACTIONS_CONFLICT,
+            {"user_id": user_id, "plaid_item_id": plaid_item_id},
+        )
+        return cur.rowcount
+
 
-def apply_transaction_modified(conn: PGConnection, *, data: dict[str, Any]) -> None:
-    """Update mutable fields on an existing transaction."""
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE transactions
-        SET amount = %(amount)s,
-            currency = %(currency)s,
-            type = %(type)s,
-            merchant_name = %(merchant_name)s,
-            description = %(description)s,
-            category = %(category)s,
-            authorized_date = %(authorized_date)s,
-            posted_date = %(posted_date)s,
-            pending = %(pending)s,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE external_txn_id = %(external_txn_id)s
-        """,
-        data,
-    )
+def upsert_transactions_added_bulk(
+    conn: PGConnection,
+    *,
+    user_id: str,
+    plaid_item_id: str,
+    rows: Iterable[dict[str, Any]],
+) -> int:
+    """Upsert (or undelete) a batch of Plaid-added transactions in one statement.
+
+    Rows carry plaid_account_id; the owning account is resolved by joining accounts
+    inside the INSERT, so rows for accounts the user/item does not own are skipped
+    without a lookup per row. Rows sharing an external_txn_id are collapsed (last one
+    wins) since a single INSERT ... ON CONFLICT cannot touch the same row twice.
+    Batches above COPY_THRESHOLD are staged with COPY first.
+    Returns the number of rows written.
+    """
+    by_external_id = {row["external_txn_id"]: row for row in rows}
+    if not by_external_id:
+        return 0
+
+    if len(by_external_id) > COPY_THRESHOLD:
+        return _upsert_transactions_added_copy(
+            conn,
+            user_id=user_id,
+            plaid_item_id=plaid_item_id,
+            rows=list(by_external_id.values()),
+        )
+
+    values = [
+        (*(row[column] for column in _TRANSACTION_BULK_COLUMNS), user_id, plaid_item_id)
+        for row in by_external_id.values()
+    ]
+    with conn.cursor() as cur:
+        returned = execute_values(
+            cur,
+            """
+            INSERT INTO transactions (
+                account_id, external_txn_id, amount, currency, type, merchant_name, description, category,
+                authorized_date, posted_date, pending, original_payer_user_id
+            )
+            SELECT
+                a.id, v.external_txn_id, v.amount, v.currency, v.type, v.merchant_name, v.description,
+                v.category, v.authorized_date, v.posted_date, v.pending, v.original_payer_user_id
+            FROM (VALUES %s) AS v (
+                plaid_account_id, external_txn_id, amount, currency, type, merchant_name, description,
+                category, authorized_date, posted_date, pending, original_payer_user_id,
+                user_id, plaid_item_id
+            )
+            JOIN accounts a
+              ON a.plaid_account_id = v.plaid_account_id
+             AND a.user_id = v.user_id
+             AND a.plaid_item_id = v.plaid_item_id
+            """
+            + _SQL_ADDED_TRANSACTIONS_CONFLICT,
+            values,
+            # Explicit casts so all-NULL columns in a page don't resolve to text.
+            template=(
+                "(%s, %s, %s::numeric, %s, %s, %s, %s, %s, %s::date, %s::date, %s::boolean,"
+                " %s::uuid, %s::uuid, %s::uuid)"
+            ),
+            page_size=500,
+            fetch=True,
+        )
+        return len(returned)
+
+
+_TRANSACTION_MODIFIED_COLUMNS = (
+    "external_txn_id",
+    "amount",
+    "currency",
+    "type",
+    "merchant_name",
+    "description",
+    "category",
+    "authorized_date",
+    "posted_date",
+    "pending",
+)
+
+
+def apply_transactions_modified_bulk(
+    conn: PGConnection, *, rows: Iterable[dict[str, Any]]
+) -> int:
+    """Update mutable fields on existing transactions in one statement.
+
+    Rows are matched on external_txn_id; duplicates are collapsed (last one wins).
+    Returns the number of rows updated.
+    """
+    by_external_id = {row["external_txn_id"]: row for row in rows}
+    if not by_external_id:
+        return 0
+
+    values = [
+        tuple(row[column] for column in _TRANSACTION_MODIFIED_COLUMNS)
+        for row in by_external_id.values()
+    ]
+    with conn.cursor() as cur:
+        returned = execute_values(
+            cur,
+            """
+            UPDATE transactions t
+            SET amount = v.amount,
+                currency = v.currency,
+                type = v.type,
+                merchant_name = v.merchant_name,
+                description = v.description,
+                category = v.category,
+                authorized_date = v.authorized_date,
+                posted_date = v.posted_date,
+                pending = v.pending,
+                updated_at = CURRENT_TIMESTAMP
+            FROM (VALUES %s) AS v (
+                external_txn_id, amount, currency, type, merchant_name, description, category,
+                authorized_date, posted_date, pending
+            )
+            WHERE t.external_txn_id = v.external_txn_id
+            RETURNING t.id
+            """,
+            values,
+            # Explicit casts so all-NULL columns in a page don't resolve to text.
+            template="(%s, %s::numeric, %s, %s, %s, %s, %s, %s::date, %s::date, %s::boolean)",
+            page_size=500,
+            fetch=True,
+        )
+        return len(returned)
+
+
+# Upper bound on ids bound into one ANY(...) array; larger removals are split.
+REMOVE_BATCH_SIZE = 1000
+
+_SQL_SOFT_DELETE_BY_EXTERNAL_IDS = """
+    UPDATE transactions t
+    SET deleted_at = COALESCE(t.deleted_at, CURRENT_TIMESTAMP), updated_at = CURRENT_TIMESTAMP
+    FROM accounts a
+    WHERE t.account_id = a.id
+      AND a.user_id = %(user_id)s::uuid
+      AND t.external_txn_id = ANY(%(ids)s::text[])
+"""
 
 
 def apply_transaction_removed(
@@ -379,55 +600,73 @@ def apply_transaction_removed(
     user_id: str,
     external_txn_ids: Iterable[str],
 ) -> int:
-    """Soft delete transactions by external id for the given user."""
-    ids = list(external_txn_ids)
+    """Soft delete transactions by external id for the given user.
+
+    Ids are sent in chunks of REMOVE_BATCH_SIZE on the same cursor; the caller
+    commits once for the whole removal.
+    """
+    ids = list(dict.fromkeys(external_txn_ids))
     if not ids:
         return 0
 
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE transactions t
-        SET deleted_at = COALESCE(t.deleted_at, CURRENT_TIMESTAMP), updated_at = CURRENT_TIMESTAMP
-        FROM accounts a
-        WHERE t.account_id = a.id
-          AND a.user_id = %(user_id)s::uuid
-          AND t.external_txn_id = ANY(%(ids)s)
-        """,
-        {"user_id": user_id, "ids": ids},
-    )
-    return cur.rowcount
+    removed = 0
+    with conn.cursor() as cur:
+        for start in range(0, len(ids), REMOVE_BATCH_SIZE):
+            cur.execute(
+                _SQL_SOFT_DELETE_BY_EXTERNAL_IDS,
+                {"user_id": user_id, "ids": ids[start:start + REMOVE_BATCH_SIZE]},
+            )
+            removed += cur.rowcount
+    return removed
 
 
 def relink_pending_to_posted(
     conn: PGConnection,
     *,
+    user_id: str,
+    plaid_item_id: str,
+    plaid_account_id: str,
     pending_transaction_id: str,
     posted_transaction_id: str,
     posted_data: dict[str, Any],
-) -> bool:
-    """Relink a pending transaction row to its posted counterpart if it exists."""
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE transactions
-        SET external_txn_id = %(posted_id)s,
-            amount = %(amount)s,
-            currency = %(currency)s,
-            type = %(type)s,
-            merchant_name = %(merchant_name)s,
-            description = %(description)s,
-            category = %(category)s,
-            authorized_date = %(authorized_date)s,
-            posted_date = %(posted_date)s,
-            pending = FALSE,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE external_txn_id = %(pending_id)s
-        """,
-        {
-            "posted_id": posted_transaction_id,
-            "pending_id": pending_transaction_id,
-            **posted_data,
-        },
-    )
-    return cur.rowcount > 0
+) -> Optional[Transaction]:
+    """Relink a pending transaction row to its posted counterpart if it exists.
+
+    Only a pending row on the user's account plaid_account_id under this item is
+    touched, the same ownership scope the bulk insert of added rows applies.
+    Returns the relinked row, or None when no pending row matched.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            UPDATE transactions t
+            SET external_txn_id = %(posted_id)s,
+                amount = %(amount)s,
+                currency = %(currency)s,
+                type = %(type)s,
+                merchant_name = %(merchant_name)s,
+                description = %(description)s,
+                category = %(category)s,
+                authorized_date = %(authorized_date)s,
+                posted_date = %(posted_date)s,
+                pending = FALSE,
+                updated_at = CURRENT_TIMESTAMP
+            FROM accounts a
+            WHERE t.external_txn_id = %(pending_id)s
+              AND t.account_id = a.id
+              AND a.plaid_account_id = %(scope_plaid_account_id)s
+              AND a.user_id = %(scope_user_id)s::uuid
+              AND a.plaid_item_id = %(scope_plaid_item_id)s::uuid
+            RETURNING {_TRANSACTION_COLUMNS_T}
+            """,
+            {
+                **posted_data,
+                "posted_id": posted_transaction_id,
+                "pending_id": pending_transaction_id,
+                "scope_plaid_account_id": plaid_account_id,
+                "scope_user_id": user_id,
+                "scope_plaid_item_id": plaid_item_id,
+            },
+        )
+        row = cur.fetchone()
+        return _build_transaction(row) if row else None
@@ -1,17 +1,24 @@
 import logging
+from dataclasses import dataclass, fields
 from datetime import date, datetime
-from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
 from typing import Any, Dict, Iterable, List, Optional, Sequence
+from uuid import uuid4
 
-from pydantic import BaseModel
+from psycopg2.extras import Json
 
-from database.supabase.orm import get_connection
-from utils.database import row_to_model_with_cursor
+from database.supabase.orm import borrow_connection
+from utils.database import copy_csv_buffer
 
 logger = logging.getLogger(__name__)
 
+# Rows per round trip when streaming split reads from a server-side cursor.
+SCAN_BATCH_SIZE = 1000
 
-class TransactionSplit(BaseModel):
+
+@dataclass(slots=True, frozen=True)
+class TransactionSplit:
     id: str
     transaction_id: str
     debtor_user_id: str
@@ -23,13 +30,15 @@ class TransactionSplit(BaseModel):
     deleted_at: Optional[datetime]
 
 
-class FriendSplitBalance(BaseModel):
+@dataclass(slots=True, frozen=True)
+class FriendSplitBalance:
     friend_user_id: str
     amount_owed_to_user: float
     amount_user_owes: float
 
 
-class SplitWithTransaction(BaseModel):
+@dataclass(slots=True, frozen=True)
+class SplitWithTransaction:
     id: str
     transaction_id: str
     debtor_user_id: str
@@ -49,28 +58,35 @@ class SplitWithTransaction(BaseModel):
     posted_date: Optional[date]
 
 
-def _decimal_to_float(value: Decimal | None) -> float:
-    return float(value) if value is not None else 0.0
+# Columns in field order: statements selecting/returning exactly these build rows
+# positionally (TransactionSplit(*row)) without reading cursor.description.
+_TRANSACTION_SPLIT_COLUMNS = ", ".join(field.name for field in fields(TransactionSplit))
+
+# SplitWithTransaction fields, in order, from transaction_splits ts JOIN transactions t.
+_SPLIT_WITH_TRANSACTION_COLUMNS = """
+        ts.id,
+        ts.transaction_id,
+        ts.debtor_user_id,
+        ts.amount,
+        ts.share_weight,
+        ts.note,
+        ts.created_at,
+        ts.updated_at,
+        t.original_payer_user_id AS payer_user_id,
+        t.amount AS transaction_amount,
+        t.currency AS transaction_currency,
+        t.type AS transaction_type,
+        t.description AS transaction_description,
+        t.merchant_name,
+        t.category,
+        t.authorized_date,
+        t.posted_date
+"""
 
 
 def list_splits_for_transaction(transaction_id: str) -> List[TransactionSplit]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            SELECT * FROM transaction_splits
-            WHERE transaction_id = %(transaction_id)s::uuid
-              AND deleted_at IS NULL
-            ORDER BY created_at ASC
-            """,
-            {"transaction_id": transaction_id},
-        )
-        rows = cur.fetchall()
-        return [row_to_model_with_cursor(r, TransactionSplit, cur) for r in rows]
-    finally:
-        cur.close()
-        conn.close()
+    """Live splits of one transaction; use list_splits_for_transactions() for several."""
+    return list_splits_for_transactions([transaction_id]).get(transaction_id, [])
 
 
 def list_splits_for_transactions(transaction_ids: Iterable[str]) -> Dict[str, List[TransactionSplit]]:
@@ -78,28 +94,24 @@ def list_splits_for_transactions(transaction_ids: Iterable[str]) -> Dict[str, Li
     if not ids:
         return {}
 
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    # Bounded by the ids passed in, so a plain cursor: a named one would add
+    # DECLARE/FETCH/CLOSE round trips to what is usually a handful of rows.
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
-            """
-            SELECT *
+            f"""
+            SELECT {_TRANSACTION_SPLIT_COLUMNS}
             FROM transaction_splits
             WHERE transaction_id = ANY(%(ids)s::uuid[])
               AND deleted_at IS NULL
-            ORDER BY created_at ASC
+            ORDER BY transaction_id, created_at ASC
             """,
             {"ids": ids},
         )
-        rows = cur.fetchall()
+        # Rows arrive grouped by transaction_id (column 1), so each group is one run.
         grouped: Dict[str, List[TransactionSplit]] = {tid: [] for tid in ids}
-        for row in rows:
-            split = row_to_model_with_cursor(row, TransactionSplit, cur)
-            grouped.setdefault(split.transaction_id, []).append(split)
+        for transaction_id, rows in groupby(cur, key=itemgetter(1)):
+            grouped[transaction_id] = [TransactionSplit(*row) for row in rows]
         return grouped
-    finally:
-        cur.close()
-        conn.close()
 
 
 def sum_splits_for_transactions(transaction_ids: Iterable[str]) -> Dict[str, float]:
@@ -107,9 +119,7 @@ def sum_splits_for_transactions(transaction_ids: Iterable[str]) -> Dict[str, flo
     if not ids:
         return {}
 
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
             """
             SELECT transaction_id, SUM(amount) AS total_amount
@@ -120,15 +130,114 @@ def sum_splits_for_transactions(transaction_ids: Iterable[str]) -> Dict[str, flo
             """,
             {"ids": ids},
         )
-        rows = cur.fetchall()
-        return {
-            row[0]: _decimal_to_float(row[1])
-            for row in rows
-            if row and row[0]
-        }
-    finally:
-        cur.close()
-        conn.close()
+        return {transaction_id: total for transaction_id, total in cur.fetchall()}
+
+
+# Everything after the payload CTE; shared by the JSON and COPY-staged variants.
+_SQL_REPLACE_TRANSACTION_SPLITS_FROM_PAYLOAD = f"""
+    removed AS (
+        UPDATE transaction_splits
+        SET deleted_at = CURRENT_TIMESTAMP,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE transaction_id = %(transaction_id)s::uuid
+          AND deleted_at IS NULL
+          AND debtor_user_id NOT IN (SELECT debtor_user_id FROM payload)
+    ),
+    upserted AS (
+        INSERT INTO transaction_splits (
+            transaction_id,
+            debtor_user_id,
+            amount,
+            share_weight,
+            note,
+            created_at,
+            updated_at,
+            deleted_at
+        )
+        SELECT
+            %(transaction_id)s::uuid,
+            debtor_user_id,
+            amount,
+            share_weight,
+            note,
+            CURRENT_TIMESTAMP,
+            CURRENT_TIMESTAMP,
+            NULL
+        FROM payload
+        ON CONFLICT (transaction_id, debtor_user_id) DO UPDATE SET
+            amount = EXCLUDED.amount,
+            share_weight = EXCLUDED.share_weight,
+            note = EXCLUDED.note,
+            updated_at = CURRENT_TIMESTAMP,
+            deleted_at = NULL
+        RETURNING {_TRANSACTION_SPLIT_COLUMNS}
+    )
+    SELECT {_TRANSACTION_SPLIT_COLUMNS} FROM upserted
+"""
+
+_SQL_REPLACE_TRANSACTION_SPLITS = f"""
+    WITH payload AS (
+        SELECT *
+        FROM jsonb_to_recordset(%(payload)s::jsonb) AS p (
+            debtor_user_id uuid,
+            amount numeric,
+            share_weight numeric,
+            note text
+        )
+    ),
+    {_SQL_REPLACE_TRANSACTION_SPLITS_FROM_PAYLOAD}
+"""
+
+_SPLIT_PAYLOAD_COLUMNS = ("debtor_user_id", "amount", "share_weight", "note")
+
+_SQL_CREATE_SPLIT_PAYLOAD_STAGE = """
+    CREATE TEMP TABLE IF NOT EXISTS split_payload_stage (
+        debtor_user_id UUID,
+        amount NUMERIC,
+        share_weight NUMERIC,
+        note TEXT
+    ) ON COMMIT DROP;
+    TRUNCATE split_payload_stage;
+"""
+
+_SQL_REPLACE_TRANSACTION_SPLITS_STAGED = f"""
+    WITH payload AS (
+        SELECT {", ".join(_SPLIT_PAYLOAD_COLUMNS)} FROM split_payload_stage
+    ),
+    {_SQL_REPLACE_TRANSACTION_SPLITS_FROM_PAYLOAD}
+"""
+
+# Payloads larger than this are loaded with COPY into a staging table instead of
+# being bound as one JSON parameter (very large group expenses).
+SPLIT_COPY_THRESHOLD = 100
+
+
+def _replace_transaction_splits_copy(
+    transaction_id: str,
+    payload: List[Dict[str, Any]],
+) -> List[TransactionSplit]:
+    buf = copy_csv_buffer(
+        [split[column] for column in _SPLIT_PAYLOAD_COLUMNS] for split in payload
+    )
+    # The stage is dropped on commit, so this path runs as one explicit transaction.
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute(_SQL_CREATE_SPLIT_PAYLOAD_STAGE)
+            cur.copy_expert(
+                f"COPY split_payload_stage ({', '.join(_SPLIT_PAYLOAD_COLUMNS)}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buf,
+            )
+            cur.execute(
+                _SQL_REPLACE_TRANSACTION_SPLITS_STAGED,
+                {"transaction_id": transaction_id},
+            )
+            splits = [TransactionSplit(*row) for row in cur.fetchall()]
+            conn.commit()
+            return splits
+        except Exception:
+            logger.exception("Failed to replace splits for transaction %s", transaction_id)
+            raise
 
 
 def replace_transaction_splits(
@@ -136,271 +245,122 @@ def replace_transaction_splits(
     transaction_id: str,
     splits: Sequence[Dict[str, Any]],
 ) -> List[TransactionSplit]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            SELECT id, debtor_user_id
-            FROM transaction_splits
-            WHERE transaction_id = %(transaction_id)s::uuid
-              AND deleted_at IS NULL
-            """,
-            {"transaction_id": transaction_id},
-        )
-        existing_rows = cur.fetchall()
-        existing_by_debtor = {row[1]: row[0] for row in existing_rows}
-
-        retained_ids: List[str] = []
-        result_rows: List[Any] = []
-
-        for split in splits:
-            debtor_user_id = split["debtor_user_id"]
-            amount = split["amount"]
-            share_weight = split.get("share_weight")
-            note = split.get("note")
-
-            if debtor_user_id in existing_by_debtor:
-                split_id = existing_by_debtor[debtor_user_id]
-                cur.execute(
-                    """
-                    UPDATE transaction_splits
-                    SET amount = %(amount)s,
-                        share_weight = %(share_weight)s,
-                        note = %(note)s,
-                        updated_at = CURRENT_TIMESTAMP,
-                        deleted_at = NULL
-                    WHERE id = %(id)s::uuid
-                    RETURNING *
-                    """,
-                    {
-                        "id": split_id,
-                        "amount": amount,
-                        "share_weight": share_weight,
-                        "note": note,
-                    },
-                )
-                row = cur.fetchone()
-                if row:
-                    retained_ids.append(split_id)
-                    result_rows.append(row)
-            else:
-                cur.execute(
-                    """
-                    INSERT INTO transaction_splits (
-                        transaction_id,
-                        debtor_user_id,
-                        amount,
-                        share_weight,
-                        note,
-                        created_at,
-                        updated_at,
-                        deleted_at
-                    )
-                    VALUES (
-                        %(transaction_id)s::uuid,
-                        %(debtor_user_id)s::uuid,
-                        %(amount)s,
-                        %(share_weight)s,
-                        %(note)s,
-                        CURRENT_TIMESTAMP,
-                        CURRENT_TIMESTAMP,
-                        NULL
-                    )
-                    RETURNING *
-                    """,
-                    {
-                        "transaction_id": transaction_id,
-                        "debtor_user_id": debtor_user_id,
-                        "amount": amount,
-                        "share_weight": share_weight,
-                        "note": note,
-                    },
-                )
-                row = cur.fetchone()
-                if row:
-                    split_id = row[0]
-                    retained_ids.append(split_id)
-                    result_rows.append(row)
-
-        # Soft-delete any splits that are no longer present
-        if existing_by_debtor:
-            to_delete = [
-                split_id
-                for debtor, split_id in existing_by_debtor.items()
-                if split_id not in retained_ids
-            ]
-            if to_delete:
-                cur.execute(
-                    """
-                    UPDATE transaction_splits
-                    SET deleted_at = CURRENT_TIMESTAMP,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ANY(%(ids)s::uuid[])
-                    """,
-                    {"ids": to_delete},
-                )
-
-        # If payload is empty, ensure all existing splits are soft-deleted
-        if not splits and existing_by_debtor:
-            cur.execute(
-                """
-                UPDATE transaction_splits
-                SET deleted_at = CURRENT_TIMESTAMP,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE transaction_id = %(transaction_id)s::uuid
-                  AND deleted_at IS NULL
-                """,
-                {"transaction_id": transaction_id},
-            )
+    """Make the live splits of a transaction exactly the given payload.
+
+    One statement soft-deletes splits for debtors missing from the payload and
+    inserts, updates or revives the rest. A debtor listed twice keeps its last
+    entry. Payloads above SPLIT_COPY_THRESHOLD are staged with COPY first.
+    """
+    by_debtor = {str(split["debtor_user_id"]): split for split in splits}
+    payload = [
+        {
+            "debtor_user_id": debtor_user_id,
+            "amount": split["amount"],
+            "share_weight": split.get("share_weight"),
+            "note": split.get("note"),
+        }
+        for debtor_user_id, split in by_debtor.items()
+    ]
 
-        conn.commit()
+    if len(payload) > SPLIT_COPY_THRESHOLD:
+        return _replace_transaction_splits_copy(transaction_id, payload)
 
-        # Map result rows to models
-        return [row_to_model_with_cursor(r, TransactionSplit, cur) for r in result_rows]
-    except Exception as exc:
-        conn.rollback()
-        logger.exception("Failed to replace splits for transaction %s", transaction_id)
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    # A single statement: autocommit makes it atomic without a COMMIT round trip.
+    with borrow_connection(autocommit=True) as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                _SQL_REPLACE_TRANSACTION_SPLITS,
+                {"transaction_id": transaction_id, "payload": Json(payload)},
+            )
+            return [TransactionSplit(*row) for row in cur.fetchall()]
+        except Exception as exc:
+            logger.exception("Failed to replace splits for transaction %s", transaction_id)
+            raise
 
 
 def list_friend_balances_for_user(user_id: str) -> List[FriendSplitBalance]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor(name=f"split_scan_{uuid4().hex}") as cur:
+        cur.itersize = SCAN_BATCH_SIZE
         cur.execute(
             """
-            WITH friend_balances AS (
-                SELECT
-                    CASE
-                        WHEN t.original_payer_user_id = %(user_id)s::uuid THEN ts.debtor_user_id
-                        ELSE t.original_payer_user_id
-                    END AS friend_user_id,
-                    SUM(
-                        CASE WHEN t.original_payer_user_id = %(user_id)s::uuid THEN ts.amount ELSE 0 END
-                    ) AS amount_owed_to_user,
-                    SUM(
-                        CASE WHEN ts.debtor_user_id = %(user_id)s::uuid THEN ts.amount ELSE 0 END
-                    ) AS amount_user_owes
+            WITH owed_to_user AS (
+                SELECT ts.debtor_user_id AS friend_user_id, SUM(ts.amount) AS amount
+                FROM transactions t
+                JOIN transaction_splits ts ON ts.transaction_id = t.id
+                WHERE t.original_payer_user_id = %(user_id)s::uuid
+                  AND t.deleted_at IS NULL
+                  AND ts.deleted_at IS NULL
+                GROUP BY 1
+            ),
+            user_owes AS (
+                SELECT t.original_payer_user_id AS friend_user_id, SUM(ts.amount) AS amount
                 FROM transaction_splits ts
-                JOIN transactions t ON ts.transaction_id = t.id
-                WHERE ts.deleted_at IS NULL
+                JOIN transactions t ON t.id = ts.transaction_id
+                WHERE ts.debtor_user_id = %(user_id)s::uuid
+                  AND ts.deleted_at IS NULL
                   AND t.deleted_at IS NULL
-                  AND (
-                        t.original_payer_user_id = %(user_id)s::uuid
-                        OR ts.debtor_user_id = %(user_id)s::uuid
-                  )
                 GROUP BY 1
             )
-            SELECT friend_user_id, amount_owed_to_user, amount_user_owes
-            FROM friend_balances
+            SELECT
+                friend_user_id,
+                COALESCE(o.amount, 0) AS amount_owed_to_user,
+                COALESCE(w.amount, 0) AS amount_user_owes
+            FROM owed_to_user o
+            FULL OUTER JOIN user_owes w USING (friend_user_id)
             WHERE friend_user_id IS NOT NULL AND friend_user_id <> %(user_id)s::uuid
             ORDER BY friend_user_id
             """,
             {"user_id": user_id},
         )
-        rows = cur.fetchall()
-        balances: List[FriendSplitBalance] = []
-        for row in rows:
-            friend_user_id, owed_to_user, user_owes = row
-            balances.append(
-                FriendSplitBalance(
-                    friend_user_id=str(friend_user_id),
-                    amount_owed_to_user=_decimal_to_float(owed_to_user),
-                    amount_user_owes=_decimal_to_float(user_owes),
-                )
-            )
-        return balances
-    finally:
-        cur.close()
-        conn.close()
+        return [FriendSplitBalance(*row) for row in cur]
+
+
+_SQL_LIST_SPLITS_BETWEEN_USERS_LEG = """
+    SELECT {columns}
+    FROM transactions t
+    JOIN transaction_splits ts ON ts.transaction_id = t.id
+    WHERE t.original_payer_user_id = %({payer})s::uuid
+      AND ts.debtor_user_id = %({debtor})s::uuid
+      AND t.deleted_at IS NULL
+      AND ts.deleted_at IS NULL
+"""
+
+# One leg per direction instead of an OR across both tables, so each leg can use
+# the payer/debtor indexes from migration 013 and the two pre-sorted inputs are
+# merged rather than bitmap-OR'ed and sorted as a whole.
+_SQL_LIST_SPLITS_BETWEEN_USERS = f"""
+    {_SQL_LIST_SPLITS_BETWEEN_USERS_LEG.format(
+        columns=_SPLIT_WITH_TRANSACTION_COLUMNS, payer="user_id", debtor="friend_id"
+    )}
+    UNION ALL
+    {_SQL_LIST_SPLITS_BETWEEN_USERS_LEG.format(
+        columns=_SPLIT_WITH_TRANSACTION_COLUMNS, payer="friend_id", debtor="user_id"
+    )}
+    ORDER BY posted_date DESC NULLS LAST, created_at DESC
+"""
 
 
 def list_splits_between_users(user_id: str, friend_user_id: str) -> List[SplitWithTransaction]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
-            """
-            SELECT
-                ts.id,
-                ts.transaction_id,
-                ts.debtor_user_id,
-                ts.amount,
-                ts.share_weight,
-                ts.note,
-                ts.created_at,
-                ts.updated_at,
-                t.original_payer_user_id AS payer_user_id,
-                t.amount AS transaction_amount,
-                t.currency AS transaction_currency,
-                t.type AS transaction_type,
-                t.description AS transaction_description,
-                t.merchant_name,
-                t.category,
-                t.authorized_date,
-                t.posted_date
-            FROM transaction_splits ts
-            JOIN transactions t ON ts.transaction_id = t.id
-            WHERE ts.deleted_at IS NULL
-              AND t.deleted_at IS NULL
-              AND (
-                    (t.original_payer_user_id = %(user_id)s::uuid AND ts.debtor_user_id = %(friend_id)s::uuid)
-                 OR (t.original_payer_user_id = %(friend_id)s::uuid AND ts.debtor_user_id = %(user_id)s::uuid)
-              )
-            ORDER BY t.posted_date DESC NULLS LAST, ts.created_at DESC
-            """,
+            _SQL_LIST_SPLITS_BETWEEN_USERS,
             {"user_id": user_id, "friend_id": friend_user_id},
         )
-        rows = cur.fetchall()
-        return [row_to_model_with_cursor(r, SplitWithTransaction, cur) for r in rows]
-    finally:
-        cur.close()
-        conn.close()
+        return [SplitWithTransaction(*row) for row in cur.fetchall()]
 
 
 def get_split_by_id(split_id: str) -> Optional[SplitWithTransaction]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    with borrow_connection() as conn, conn.cursor() as cur:
         cur.execute(
-            """
-            SELECT
-                ts.id,
-                ts.transaction_id,
-                ts.debtor_user_id,
-                ts.amount,
-                ts.share_weight,
-                ts.note,
-                ts.created_at,
-                ts.updated_at,
-                t.original_payer_user_id AS payer_user_id,
-                t.amount AS transaction_amount,
-                t.currency AS transaction_currency,
-                t.type AS transaction_type,
-                t.description AS transaction_description,
-                t.merchant_name,
-                t.category,
-                t.authorized_date,
-                t.posted_date
+            f"""
+            SELECT {_SPLIT_WITH_TRANSACTION_COLUMNS}
             FROM transaction_splits ts
             JOIN transactions t ON ts.transaction_id = t.id
-            WHERE ts.id = %(split_id)s::uuid
+            WHERE ts.id = %s::uuid
               AND ts.deleted_at IS NULL
               AND t.deleted_at IS NULL
             """,
-            {"split_id": split_id},
+            (split_id,),
         )
         row = cur.fetchone()
-        return row_to_model_with_cursor(row, SplitWithTransaction, cur) if row else None
-    finally:
-        cur.close()
-        conn.close()
-
-
-def list_participants_for_transaction(transaction_id: str) -> List[TransactionSplit]:
-    """Return splits (participants) including soft-deleted ones filtered out."""
-    return list_splits_for_transaction(transaction_id)
+        return SplitWithTransaction(*row) if row else None
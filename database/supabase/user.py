@@ -1,12 +1,14 @@
 import logging
 from datetime import datetime
 from typing import Optional
- 
 
 from pydantic import BaseModel
 
-from database.supabase.orm import get_connection
-from utils.database import row_to_model_with_cursor
+from database.supabase.orm import (borrow_connection, execute_prepared,
+                                   prepare_statement)
+from utils.constants import USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS
+from utils.database import model_builder
+from utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -30,58 +32,124 @@ class User(BaseModel):
     updated_at: datetime
 
 
+# Column list in User field order; every statement below selects/returns exactly
+# these columns, so rows are built positionally without reading cursor.description.
+_USER_FIELDS = tuple(User.model_fields)
+_USER_COLUMNS = ", ".join(_USER_FIELDS)
+_build_user = model_builder(User, _USER_FIELDS)
+
+
+# Per-process caches for the lookups made on every authenticated request. Writes
+# through this module refresh or drop the affected entries; changes made by other
+# workers are picked up once the entry expires.
+_USER_BY_ID: TTLCache[str, User] = TTLCache(
+    maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS
+)
+_USER_BY_IDP: TTLCache[tuple[str, str], User] = TTLCache(
+    maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS
+)
+
+
+def _cache_user(user: User) -> None:
+    _USER_BY_ID.set(user.id, user)
+    _USER_BY_IDP.set((user.idp_id, user.provider), user)
+
+
+def _forget_user(user_id: str, idp_key: Optional[tuple[str, str]] = None) -> None:
+    """
+    Drop a user from both caches. The two caches evict independently, so pass the
+    (idp_id, provider) key when it is known rather than relying on the id entry.
+    """
+    cached = _USER_BY_ID.get(user_id)
+    _USER_BY_ID.pop(user_id)
+    if cached is not None:
+        _USER_BY_IDP.pop((cached.idp_id, cached.provider))
+    if idp_key is not None:
+        _USER_BY_IDP.pop(idp_key)
+
+
+# Point lookups on the auth and API paths, prepared once per pooled connection.
+_STMT_GET_USER_BY_IDP_ID_AND_PROVIDER = prepare_statement(
+    "get_user_by_idp_id_and_provider",
+    f"SELECT {_USER_COLUMNS} FROM users WHERE idp_id = $1 AND provider = $2",
+)
+_STMT_GET_USER_BY_EMAIL = prepare_statement(
+    "get_user_by_email",
+    f"SELECT {_USER_COLUMNS} FROM users WHERE email = $1",
+)
+_STMT_GET_USER_BY_ID = prepare_statement(
+    "get_user_by_id",
+    f"SELECT {_USER_COLUMNS} FROM users WHERE id = $1::uuid",
+)
+# None leaves a column unchanged, so every update shares one prepared plan.
+_STMT_UPDATE_USER_INFO = prepare_statement(
+    "update_user_info",
+    f"""
+    UPDATE users
+    SET idp_id = COALESCE($2, idp_id),
+        given_name = COALESCE($3, given_name),
+        family_name = COALESCE($4, family_name),
+        full_name = COALESCE($5, full_name),
+        photo_url = COALESCE($6, photo_url),
+        email_verified = COALESCE($7, email_verified),
+        provider = COALESCE($8, provider),
+        last_login_at = CASE WHEN $9::boolean THEN CURRENT_TIMESTAMP ELSE last_login_at END,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = $1::uuid
+    RETURNING {_USER_COLUMNS}
+    """,
+)
+_STMT_UPDATE_USER_LAST_LOGIN = prepare_statement(
+    "update_user_last_login",
+    f"UPDATE users SET last_login_at = CURRENT_TIMESTAMP WHERE id = $1::uuid RETURNING {_USER_COLUMNS}",
+)
+
+
 def get_user_by_idp_id_and_provider(idp_id: str, provider: str) -> Optional[User]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "SELECT * FROM users WHERE idp_id = %(idp_id)s AND provider = %(provider)s",
-            {"idp_id": idp_id, "provider": provider},
-        )
-        row = cur.fetchone()
-        return row_to_model_with_cursor(row, User, cur) if row else None
-    except Exception as e:
-        logger.error(f"Error getting user by IDP ID {idp_id}: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    cached = _USER_BY_IDP.get((idp_id, provider))
+    if cached is not None:
+        return cached
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            execute_prepared(cur, _STMT_GET_USER_BY_IDP_ID_AND_PROVIDER, (idp_id, provider))
+            row = cur.fetchone()
+            if not row:
+                return None
+            user = _build_user(row)
+            _cache_user(user)
+            return user
+        except Exception as e:
+            logger.error(f"Error getting user by IDP ID {idp_id}: {e}")
+            raise
 
 
 def get_user_by_email(email: str) -> Optional[User]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "SELECT * FROM users WHERE email = %(email)s",
-            {"email": email},
-        )
-        row = cur.fetchone()
-        return row_to_model_with_cursor(row, User, cur) if row else None
-    except Exception as e:
-        logger.error(f"Error getting user by email {email}: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            execute_prepared(cur, _STMT_GET_USER_BY_EMAIL, (email,))
+            row = cur.fetchone()
+            return _build_user(row) if row else None
+        except Exception as e:
+            logger.error(f"Error getting user by email {email}: {e}")
+            raise
 
 
 def get_user_by_id(user_id: str) -> Optional[User]:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "SELECT * FROM users WHERE id = %(id)s::uuid",
-            {"id": user_id},
-        )
-        row = cur.fetchone()
-        return row_to_model_with_cursor(row, User, cur) if row else None
-    except Exception as e:
-        logger.error(f"Error getting user {user_id}: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    cached = _USER_BY_ID.get(user_id)
+    if cached is not None:
+        return cached
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            execute_prepared(cur, _STMT_GET_USER_BY_ID, (user_id,))
+            row = cur.fetchone()
+            if not row:
+                return None
+            user = _build_user(row)
+            _cache_user(user)
+            return user
+        except Exception as e:
+            logger.error(f"Error getting user {user_id}: {e}")
+            raise
 
 
 def create_user(
@@ -94,40 +162,94 @@ def create_user(
     email_verified: bool,
     provider: str,
 ) -> User:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        sql = """
-            INSERT INTO users (
-                idp_id, email, given_name, family_name, full_name,
-                photo_url, email_verified, provider
-            ) VALUES (
-                %(idp_id)s, %(email)s, %(given_name)s, %(family_name)s, %(full_name)s,
-                %(photo_url)s, %(email_verified)s, %(provider)s
+    # A single statement: autocommit makes it atomic without a COMMIT round trip.
+    with borrow_connection(autocommit=True) as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                f"""
+                INSERT INTO users (
+                    idp_id, email, given_name, family_name, full_name,
+                    photo_url, email_verified, provider
+                ) VALUES (
+                    %(idp_id)s, %(email)s, %(given_name)s, %(family_name)s, %(full_name)s,
+                    %(photo_url)s, %(email_verified)s, %(provider)s
+                )
+                RETURNING {_USER_COLUMNS}
+                """,
+                {
+                    "idp_id": idp_id,
+                    "email": email,
+                    "given_name": given_name,
+                    "family_name": family_name,
+                    "full_name": full_name,
+                    "photo_url": photo_url,
+                    "email_verified": email_verified,
+                    "provider": provider,
+                },
             )
-            RETURNING *
-        """
-        params = {
-            "idp_id": idp_id,
-            "email": email,
-            "given_name": given_name,
-            "family_name": family_name,
-            "full_name": full_name,
-            "photo_url": photo_url,
-            "email_verified": email_verified,
-            "provider": provider,
-        }
-        cur.execute(sql, params)
-        row = cur.fetchone()
-        conn.commit()
-        return row_to_model_with_cursor(row, User, cur)
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error creating user {email}: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+            row = cur.fetchone()
+            user = _build_user(row)
+            _cache_user(user)
+            return user
+        except Exception as e:
+            logger.error(f"Error creating user {email}: {e}")
+            raise
+
+
+def upsert_user(
+    idp_id: str,
+    email: str,
+    given_name: Optional[str],
+    family_name: Optional[str],
+    full_name: Optional[str],
+    photo_url: Optional[str],
+    email_verified: bool,
+    provider: str,
+) -> User:
+    """
+    Insert the user, or refresh the profile of the existing (idp_id, provider) row,
+    in one statement. The email is left as is (it is unique across users) and
+    profile fields the identity provider did not send are kept.
+    """
+    with borrow_connection(autocommit=True) as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                f"""
+                INSERT INTO users (
+                    idp_id, email, given_name, family_name, full_name,
+                    photo_url, email_verified, provider, last_login_at
+                ) VALUES (
+                    %(idp_id)s, %(email)s, %(given_name)s, %(family_name)s, %(full_name)s,
+                    %(photo_url)s, %(email_verified)s, %(provider)s, CURRENT_TIMESTAMP
+                )
+                ON CONFLICT (idp_id, provider) DO UPDATE SET
+                    given_name = COALESCE(EXCLUDED.given_name, users.given_name),
+                    family_name = COALESCE(EXCLUDED.family_name, users.family_name),
+                    full_name = COALESCE(EXCLUDED.full_name, users.full_name),
+                    photo_url = COALESCE(EXCLUDED.photo_url, users.photo_url),
+                    email_verified = users.email_verified OR EXCLUDED.email_verified,
+                    last_login_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                RETURNING {_USER_COLUMNS}
+                """,
+                {
+                    "idp_id": idp_id,
+                    "email": email,
+                    "given_name": given_name,
+                    "family_name": family_name,
+                    "full_name": full_name,
+                    "photo_url": photo_url,
+                    "email_verified": email_verified,
+                    "provider": provider,
+                },
+            )
+            row = cur.fetchone()
+            user = _build_user(row)
+            _cache_user(user)
+            return user
+        except Exception as e:
+            logger.error(f"Error upserting user {email}: {e}")
+            raise
 
 
 def update_user_info(
@@ -139,89 +261,75 @@ def update_user_info(
     photo_url: Optional[str] = None,
     email_verified: Optional[bool] = None,
     provider: Optional[str] = None,
+    touch_last_login: bool = False,
 ) -> User:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        fields: dict = {}
-        if idp_id is not None:
-            fields["idp_id"] = idp_id
-        if given_name is not None:
-            fields["given_name"] = given_name
-        if family_name is not None:
-            fields["family_name"] = family_name
-        if full_name is not None:
-            fields["full_name"] = full_name
-        if photo_url is not None:
-            fields["photo_url"] = photo_url
-        if email_verified is not None:
-            fields["email_verified"] = email_verified
-        if provider is not None:
-            fields["provider"] = provider
-
-        if not fields:
-            current = get_user_by_id(user_id)
-            if current is None:
-                raise Exception(f"User {user_id} not found")
-            return current
-
-        set_clause = ", ".join([f"{k} = %({k})s" for k in fields.keys()])
-        set_clause += ", last_login_at = CURRENT_TIMESTAMP"
-        set_clause += ", updated_at = CURRENT_TIMESTAMP"
-
-        sql = f"""
-            UPDATE users
-            SET {set_clause}
-            WHERE id = %(user_id)s::uuid
-            RETURNING *
-        """
-        params = {**fields, "user_id": user_id}
-        cur.execute(sql, params)
-        row = cur.fetchone()
-        if not row:
-            raise Exception(f"Failed to update user {user_id}")
-        conn.commit()
-        return row_to_model_with_cursor(row, User, cur)
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error updating user {user_id}: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    """
+    Update the given profile fields; None leaves a column unchanged. last_login_at is
+    only bumped when touch_last_login is set, so plain profile edits don't move it.
+    """
+    with borrow_connection(autocommit=True) as conn, conn.cursor() as cur:
+        try:
+            execute_prepared(
+                cur,
+                _STMT_UPDATE_USER_INFO,
+                (
+                    user_id,
+                    idp_id,
+                    given_name,
+                    family_name,
+                    full_name,
+                    photo_url,
+                    email_verified,
+                    provider,
+                    touch_last_login,
+                ),
+            )
+            row = cur.fetchone()
+            if not row:
+                raise Exception(f"Failed to update user {user_id}")
+            _forget_user(user_id)
+            user = _build_user(row)
+            _cache_user(user)
+            return user
+        except Exception as e:
+            logger.error(f"Error updating user {user_id}: {e}")
+            raise
 
 
 def update_user_last_login(user_id: str) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "UPDATE users SET last_login_at = CURRENT_TIMESTAMP WHERE id = %(id)s::uuid",
-            {"id": user_id},
-        )
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error updating last login for user {user_id}: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    """
+    Stamp last_login_at on its own. The auth path does not call this: it only
+    writes the user (through upsert_user, which stamps last_login_at) when the
+    row is created or the identity provider's profile changed.
+
+    A lost last-login stamp is harmless, so the commit skips waiting for the WAL
+    flush (synchronous_commit is relaxed for this transaction only).
+    """
+    with borrow_connection() as conn, conn.cursor() as cur:
+        try:
+            cur.execute("SET LOCAL synchronous_commit TO off")
+            execute_prepared(cur, _STMT_UPDATE_USER_LAST_LOGIN, (user_id,))
+            row = cur.fetchone()
+            conn.commit()
+            # Refresh rather than drop, so the next request still hits the cache.
+            if row:
+                _cache_user(_build_user(row))
+            else:
+                _forget_user(user_id)
+        except Exception as e:
+            logger.error(f"Error updating last login for user {user_id}: {e}")
+            raise
 
 
 def hard_delete_user(user_id: str) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            "DELETE FROM users WHERE id = %(user_id)s::uuid",
-            {"user_id": user_id},
-        )
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error hard deleting user {user_id}: {e}")
-        raise
-    finally:
-        cur.close()
-        conn.close()
+    with borrow_connection(autocommit=True) as conn, conn.cursor() as cur:
+        try:
+            cur.execute(
+                "DELETE FROM users WHERE id = %s::uuid RETURNING idp_id, provider",
+                (user_id,),
+            )
+            row = cur.fetchone()
+            _forget_user(user_id, (row[0], row[1]) if row else None)
+        except Exception as e:
+            logger.error(f"Error hard deleting user {user_id}: {e}")
+            raise
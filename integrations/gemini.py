@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from dataclasses import dataclass
 from enum import Enum
-from typing import Generic, Literal, Type, TypeVar, overload
+from functools import lru_cache
+from typing import Callable, Generic, Literal, Type, TypeVar, overload
 
 from google import genai
 from google.genai import types as genai_types
@@ -21,7 +23,15 @@ logger = logging.getLogger(__name__)
 API_KEY = os.getenv("GOOGLE_API_KEY")
 MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-001")
 
-CLIENT = genai.Client(api_key=API_KEY)
+
+@lru_cache(maxsize=None)
+def _client() -> genai.Client:
+    """Process-wide Gemini client, created on first use rather than at import."""
+    return genai.Client(api_key=API_KEY)
+
+
+# Upper bound on Gemini requests in flight for one textInferenceBatch call.
+BATCH_CONCURRENCY = 8
 T = TypeVar("T", bound=BaseModel)
 
 
@@ -51,6 +61,34 @@ llmCallToConfigMap: dict[llmCallType, llmCallConfig] = {
 }
 
 
+# JSON validator per call type, resolved once. model_validate_json parses and
+# validates the raw text in pydantic-core without an intermediate dict.
+_VALIDATE_JSON_BY_TYPE: dict[llmCallType, Callable[[str], BaseModel]] = {
+    call_type: config.response_model.model_validate_json
+    for call_type, config in llmCallToConfigMap.items()
+}
+
+
+@lru_cache(maxsize=None)
+def _generate_content_config(call_type: llmCallType) -> genai_types.GenerateContentConfig:
+    """Request config for a call type, built once and reused by every call."""
+    config = llmCallToConfigMap[call_type]
+    return genai_types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=config.schema,
+        system_instruction=config.system_prompt,
+    )
+
+
+def _parse_response(
+    response: genai_types.GenerateContentResponse, call_type: llmCallType
+) -> BaseModel:
+    if not response or not response.text:
+        raise ValueError("No response from LLM")
+    logger.debug("LLM response: %s", response.text)
+    return _VALIDATE_JSON_BY_TYPE[call_type](response.text)
+
+
 @overload
 def textInference(
     prompt: str, call_type: Literal[llmCallType.transaction_categorization]
@@ -65,24 +103,55 @@ def textInference(
 
 def textInference(prompt: str, call_type: llmCallType) -> BaseModel:
     """Call Gemini LLM with a prompt and return parsed response."""
-    logging.info(f"Calling LLM with call type {call_type} and input: {prompt}")
-    config = llmCallToConfigMap[call_type]
+    logger.info("Calling LLM with call type %s", call_type.value)
+    logger.debug("LLM input: %s", prompt)
 
-    response = CLIENT.models.generate_content(
+    response = _client().models.generate_content(
         model=MODEL,
         contents=prompt,
-        config=genai.types.GenerateContentConfig(
-            response_mime_type="application/json",
-            response_schema=config.schema,
-            system_instruction=config.system_prompt,
-        ),
+        config=_generate_content_config(call_type),
     )
+    return _parse_response(response, call_type)
 
-    if not response or not response.text:
-        raise ValueError("No response from LLM")
-    logging.info(f"LLM response: {response.text}")
 
-    return config.response_model.parse_raw(response.text)
+@overload
+async def textInferenceBatch(
+    prompts: list[str], call_type: Literal[llmCallType.transaction_categorization]
+) -> list[TransactionCategorizationResponse]: ...
+
+
+@overload
+async def textInferenceBatch(
+    prompts: list[str], call_type: Literal[llmCallType.financial_advice]
+) -> list[BaseModel]: ...
+
+
+async def textInferenceBatch(
+    prompts: list[str], call_type: llmCallType
+) -> list[BaseModel]:
+    """
+    Run textInference for several prompts concurrently on the async client.
+
+    Results come back in prompt order, and wall time tracks the slowest request
+    rather than the sum. At most BATCH_CONCURRENCY requests are in flight; the
+    first failure is raised.
+    """
+    logger.info(
+        "Calling LLM with call type %s for %d prompts", call_type.value, len(prompts)
+    )
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def _infer(prompt: str) -> BaseModel:
+        logger.debug("LLM input: %s", prompt)
+        async with semaphore:
+            response = await _client().aio.models.generate_content(
+                model=MODEL,
+                contents=prompt,
+                config=_generate_content_config(call_type),
+            )
+        return _parse_response(response, call_type)
+
+    return list(await asyncio.gather(*(_infer(prompt) for prompt in prompts)))
 
 
 def generate_financial_chat_response(
@@ -103,7 +172,7 @@ def generate_financial_chat_response(
             )
         )
 
-    response = CLIENT.models.generate_content(
+    response = _client().models.generate_content(
         model=MODEL,
         contents=contents,
         config=genai_types.GenerateContentConfig(
@@ -1,5 +1,5 @@
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from typing import Any, Dict, List, Optional
 
 import plaid
@@ -29,6 +29,7 @@ from plaid.model.transactions_sync_request import (
 from database.supabase.plaid_item import (
     create_or_update_plaid_item,
     deactivate_plaid_item,
+    get_plaid_item_access_token,
     get_plaid_item_by_user_and_item,
 )
 from models.plaid import (
@@ -43,10 +44,24 @@ from models.plaid import (
     TransactionLocation,
     TransactionsResponse,
 )
-from utils.constants import ENCRYPTION_KEY, PLAID_CLIENT_ID, PLAID_ENV, PLAID_SECRET
+from utils.constants import (ENCRYPTION_KEY, PLAID_CLIENT_ID, PLAID_ENV,
+                             PLAID_SECRET, PLAID_TOKEN_CACHE_MAX_SIZE,
+                             PLAID_TOKEN_CACHE_TTL_SECONDS)
+from utils.ttl_cache import TTLCache
+
+# Optional compiled Fernet: same token format and encrypt/decrypt(bytes) -> bytes
+# API, several times faster on access-token sized payloads. Falls back to
+# cryptography's implementation when it is not installed.
+try:
+    from rfernet import Fernet as RFernet
+except ImportError:
+    RFernet = None
 
 logger = logging.getLogger(__name__)
 
+# Plaid's maximum page size for /transactions/sync (its default is 100).
+TRANSACTIONS_SYNC_PAGE_SIZE = 500
+
 
 class PlaidError(Exception):
     """Base exception for Plaid integration errors"""
@@ -78,6 +93,69 @@ class PlaidAPIError(PlaidError):
     pass
 
 
+def _account_from_plaid(account: Any) -> Account:
+    """Response model for a Plaid SDK account.
+
+    The SDK has already validated the payload, so the models are built with
+    model_construct() instead of being validated field by field again.
+    """
+    balances = account.balances
+    # Not every account type carries verification_status; the SDK raises
+    # AttributeError for unset optional fields.
+    verification_status = getattr(account, "verification_status", None)
+    return Account.model_construct(
+        account_id=account.account_id,
+        balances=AccountBalance.model_construct(
+            available=balances.available,
+            current=balances.current,
+            limit=balances.limit,
+            iso_currency_code=balances.iso_currency_code,
+            unofficial_currency_code=balances.unofficial_currency_code,
+        ),
+        mask=account.mask,
+        name=account.name,
+        official_name=account.official_name,
+        type=account.type.value,
+        subtype=account.subtype.value if account.subtype else None,
+        verification_status=verification_status.value if verification_status else None,
+    )
+
+
+def _transaction_from_plaid(transaction: Any) -> Transaction:
+    """Response model for a Plaid SDK transaction, built without re-validation."""
+    location = None
+    loc = transaction.location
+    if loc:
+        location = TransactionLocation.model_construct(
+            address=getattr(loc, "address", None),
+            city=getattr(loc, "city", None),
+            state=getattr(loc, "state", None),
+            zip=getattr(loc, "zip", None),
+            country=getattr(loc, "country", None),
+            lat=getattr(loc, "lat", None),
+            lon=getattr(loc, "lon", None),
+        )
+
+    txn_date = transaction.date
+    return Transaction.model_construct(
+        transaction_id=transaction.transaction_id,
+        account_id=transaction.account_id,
+        amount=transaction.amount,
+        # The model declares a datetime; validation used to widen the SDK's date.
+        date=(
+            txn_date
+            if isinstance(txn_date, datetime)
+            else datetime.combine(txn_date, time.min)
+        ),
+        name=transaction.name,
+        merchant_name=transaction.merchant_name,
+        category=transaction.category,
+        category_id=transaction.category_id,
+        pending=transaction.pending,
+        location=location,
+    )
+
+
 class PlaidClient:
     """Plaid API client with encryption and error handling"""
 
@@ -118,10 +196,24 @@ class PlaidClient:
         if not ENCRYPTION_KEY:
             raise PlaidConfigurationError("ENCRYPTION_KEY environment variable not set")
 
-        self.fernet = Fernet(
-            ENCRYPTION_KEY.encode()
-            if isinstance(ENCRYPTION_KEY, str)
-            else ENCRYPTION_KEY
+        if RFernet is not None:
+            self.fernet = RFernet(
+                ENCRYPTION_KEY
+                if isinstance(ENCRYPTION_KEY, str)
+                else ENCRYPTION_KEY.decode()
+            )
+        else:
+            self.fernet = Fernet(
+                ENCRYPTION_KEY.encode()
+                if isinstance(ENCRYPTION_KEY, str)
+                else ENCRYPTION_KEY
+            )
+
+        # Decrypted access tokens by (user_id, item_id). Skips the DB read and the
+        # decrypt on repeat calls; the short TTL bounds how long another worker's
+        # disconnect can go unnoticed.
+        self._token_cache: TTLCache[tuple[str, str], str] = TTLCache(
+            maxsize=PLAID_TOKEN_CACHE_MAX_SIZE, ttl=PLAID_TOKEN_CACHE_TTL_SECONDS
         )
 
         logger.info(f"Plaid client initialized for environment: {PLAID_ENV}")
@@ -198,6 +290,7 @@ class PlaidClient:
                 institution_name=institution_name,
                 is_active=True,
             )
+            self._token_cache.set((user_id, item_id), access_token)
 
             logger.info(
                 f"Public token exchanged and stored for user {user_id}, item {item_id}"
@@ -221,48 +314,15 @@ class PlaidClient:
             # Get access token from database
             if item_id:
                 # Get specific item's access token
-                encrypted_token = self._get_encrypted_token(user_id, item_id)
+                access_token = self._get_access_token(user_id, item_id)
             else:
                 # Get all items for user (simplified - you might want to implement this)
                 raise PlaidAPIError("item_id required for now")
 
-            access_token = self.decrypt_token(encrypted_token)
-
             request = AccountsGetRequest(access_token=access_token)
             response = self.plaid_client.accounts_get(request)
 
-            accounts = []
-            for account in response.accounts:
-                # Handle verification_status safely
-                verification_status = None
-                try:
-                    if (
-                        hasattr(account, "verification_status")
-                        and account.verification_status
-                    ):
-                        verification_status = account.verification_status.value
-                except AttributeError:
-                    # verification_status field doesn't exist for this account type
-                    pass
-
-                accounts.append(
-                    Account(
-                        account_id=account.account_id,
-                        balances=AccountBalance(
-                            available=account.balances.available,
-                            current=account.balances.current,
-                            limit=account.balances.limit,
-                            iso_currency_code=account.balances.iso_currency_code,
-                            unofficial_currency_code=account.balances.unofficial_currency_code,
-                        ),
-                        mask=account.mask,
-                        name=account.name,
-                        official_name=account.official_name,
-                        type=account.type.value,
-                        subtype=account.subtype.value if account.subtype else None,
-                        verification_status=verification_status,
-                    )
-                )
+            accounts = [_account_from_plaid(account) for account in response.accounts]
 
             logger.info(f"Retrieved {len(accounts)} accounts for user {user_id}")
             return accounts
@@ -281,8 +341,7 @@ class PlaidClient:
     ) -> TransactionsResponse:
         """Get transactions for user with optional date filtering"""
         try:
-            encrypted_token = self._get_encrypted_token(user_id, item_id)
-            access_token = self.decrypt_token(encrypted_token)
+            access_token = self._get_access_token(user_id, item_id)
 
             # Default to last 30 days if no dates provided
             if not start_date:
@@ -305,41 +364,10 @@ class PlaidClient:
 
             response = self.plaid_client.transactions_get(request)
 
-            transactions = []
-            for transaction in response.transactions:
-                # Handle location data safely
-                location_data = None
-                if transaction.location:
-                    try:
-                        location_data = TransactionLocation(
-                            address=getattr(transaction.location, "address", None),
-                            city=getattr(transaction.location, "city", None),
-                            state=getattr(transaction.location, "state", None),
-                            zip=getattr(transaction.location, "zip", None),
-                            country=getattr(transaction.location, "country", None),
-                            lat=getattr(transaction.location, "lat", None),
-                            lon=getattr(transaction.location, "lon", None),
-                        )
-                    except AttributeError as e:
-                        logger.warning(
-                            f"Error processing location data for transaction {transaction.transaction_id}: {e}"
-                        )
-                        location_data = None
-
-                transactions.append(
-                    Transaction(
-                        transaction_id=transaction.transaction_id,
-                        account_id=transaction.account_id,
-                        amount=transaction.amount,
-                        date=transaction.date,
-                        name=transaction.name,
-                        merchant_name=transaction.merchant_name,
-                        category=transaction.category,
-                        category_id=transaction.category_id,
-                        pending=transaction.pending,
-                        location=location_data,
-                    )
-                )
+            transactions = [
+                _transaction_from_plaid(transaction)
+                for transaction in response.transactions
+            ]
 
             return TransactionsResponse(
                 transactions=transactions,
@@ -354,8 +382,7 @@ class PlaidClient:
     def sync_transactions(self, user_id: str, item_id: str) -> SyncResponse:
         """Manual sync for new transactions"""
         try:
-            encrypted_token = self._get_encrypted_token(user_id, item_id)
-            access_token = self.decrypt_token(encrypted_token)
+            access_token = self._get_access_token(user_id, item_id)
 
             request = TransactionsSyncRequest(access_token=access_token)
             response = self.plaid_client.transactions_sync(request)
@@ -385,10 +412,12 @@ class PlaidClient:
         Returns (added, modified, removed, next_cursor, has_more)
         """
         try:
-            encrypted_token = self._get_encrypted_token(user_id, item_id)
-            access_token = self.decrypt_token(encrypted_token)
+            access_token = self._get_access_token(user_id, item_id)
 
-            request_payload: dict[str, Any] = {"access_token": access_token}
+            request_payload: dict[str, Any] = {
+                "access_token": access_token,
+                "count": TRANSACTIONS_SYNC_PAGE_SIZE,
+            }
             if cursor is not None:
                 request_payload["cursor"] = cursor
 
@@ -411,8 +440,7 @@ class PlaidClient:
     def get_item_status(self, user_id: str, item_id: str) -> ItemStatusResponse:
         """Check item status and health"""
         try:
-            encrypted_token = self._get_encrypted_token(user_id, item_id)
-            access_token = self.decrypt_token(encrypted_token)
+            access_token = self._get_access_token(user_id, item_id)
 
             request = ItemGetRequest(access_token=access_token)
             response = self.plaid_client.item_get(request)
@@ -448,34 +476,12 @@ class PlaidClient:
     def get_balances(self, user_id: str, item_id: str) -> List[Account]:
         """Get current balances for all accounts"""
         try:
-            encrypted_token = self._get_encrypted_token(user_id, item_id)
-            access_token = self.decrypt_token(encrypted_token)
+            access_token = self._get_access_token(user_id, item_id)
 
             request = AccountsBalanceGetRequest(access_token=access_token)
             response = self.plaid_client.accounts_balance_get(request)
 
-            balances = []
-            for account in response.accounts:
-                balances.append(
-                    Account(
-                        account_id=account.account_id,
-                        balances=AccountBalance(
-                            available=account.balances.available,
-                            current=account.balances.current,
-                            limit=account.balances.limit,
-                            iso_currency_code=account.balances.iso_currency_code,
-                            unofficial_currency_code=account.balances.unofficial_currency_code,
-                        ),
-                        mask=account.mask,
-                        name=account.name,
-                        official_name=account.official_name,
-                        type=account.type.value,
-                        subtype=account.subtype.value if account.subtype else None,
-                        verification_status=account.verification_status.value
-                        if account.verification_status
-                        else None,
-                    )
-                )
+            balances = [_account_from_plaid(account) for account in response.accounts]
 
             logger.info(
                 f"Retrieved balances for {len(balances)} accounts for user {user_id}"
@@ -489,8 +495,7 @@ class PlaidClient:
     def disconnect_item(self, user_id: str, item_id: str) -> DisconnectResponse:
         """Disconnect specific institution"""
         try:
-            encrypted_token = self._get_encrypted_token(user_id, item_id)
-            access_token = self.decrypt_token(encrypted_token)
+            access_token = self._get_access_token(user_id, item_id)
 
             # Remove from Plaid
             request = ItemRemoveRequest(access_token=access_token)
@@ -501,6 +506,7 @@ class PlaidClient:
             if not item:
                 raise PlaidItemNotFoundError("Item not found or access denied")
             deactivate_plaid_item(item.id)
+            self._token_cache.pop((user_id, item_id))
 
             logger.info(f"Item {item_id} disconnected for user {user_id}")
 
@@ -512,13 +518,22 @@ class PlaidClient:
             logger.error(f"Failed to disconnect item {item_id} for user {user_id}: {e}")
             raise PlaidAPIError(f"Failed to disconnect item: {e}")
 
+    def _get_access_token(self, user_id: str, item_id: str) -> str:
+        """Decrypted access token for the user's item, from the token cache when fresh"""
+        key = (user_id, item_id)
+        access_token = self._token_cache.get(key)
+        if access_token is None:
+            encrypted_token = self._get_encrypted_token(user_id, item_id)
+            access_token = self.decrypt_token(encrypted_token)
+            self._token_cache.set(key, access_token)
+        return access_token
+
     def _get_encrypted_token(self, user_id: str, item_id: str) -> str:
         """Helper method to get encrypted token from database"""
-        item = get_plaid_item_by_user_and_item(user_id, item_id)
-        if not item:
+        encrypted_token = get_plaid_item_access_token(user_id, item_id)
+        if encrypted_token is None:
             raise PlaidItemNotFoundError("Item not found or access denied")
 
-        encrypted_token = item.access_token
         if not isinstance(encrypted_token, str):
             raise PlaidTokenError("Encrypted token is not a string")
 
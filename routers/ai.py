@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import json
 import logging
+from contextlib import closing
 from datetime import date, timedelta
+from itertools import islice
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -10,6 +12,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from database.supabase import transaction as transaction_repo
 from database.supabase import transaction_split as split_repo
 from database.supabase.balance import get_friend_balances_for_user
+from database.supabase.orm import parallel
 from integrations.gemini import generate_financial_chat_response
 from models.ai import ChatMessage, ChatRequest, ChatResponse
 from models.auth_user import AuthUser
@@ -30,17 +33,33 @@ def _trim_history(messages: List[ChatMessage]) -> List[ChatMessage]:
     return messages[-MAX_HISTORY_MESSAGES:]
 
 
+def _recent_transactions(user_id: str) -> List[transaction_repo.TransactionRow]:
+    with closing(
+        transaction_repo.iter_transactions_for_user(user_id, batch=RECENT_TRANSACTIONS_LIMIT)
+    ) as transactions:
+        return list(islice(transactions, RECENT_TRANSACTIONS_LIMIT))
+
+
 def _build_financial_snapshot(user_id: str) -> dict:
     today = date.today()
     start_date = today - timedelta(days=SUMMARY_DAYS)
 
-    spending_by_category = transaction_repo.get_spending_by_category_for_user(
-        user_id,
-        start_date=start_date,
-        end_date_exclusive=today + timedelta(days=1),
+    (
+        spending_by_category,
+        transactions,
+        (friend_credit, friend_debt),
+        friend_balances,
+    ) = parallel(
+        lambda: transaction_repo.get_spending_by_category_for_user(
+            user_id,
+            start_date=start_date,
+            end_date_exclusive=today + timedelta(days=1),
+        ),
+        lambda: _recent_transactions(user_id),
+        lambda: get_friend_balances_for_user(user_id),
+        lambda: split_repo.list_friend_balances_for_user(user_id),
     )
 
-    transactions = transaction_repo.list_transactions_for_user(user_id)[:RECENT_TRANSACTIONS_LIMIT]
     transaction_items = [
         {
             "description": txn.description or txn.merchant_name,
@@ -51,9 +70,6 @@ def _build_financial_snapshot(user_id: str) -> dict:
         for txn in transactions
     ]
 
-    friend_credit, friend_debt = get_friend_balances_for_user(user_id)
-
-    friend_balances = split_repo.list_friend_balances_for_user(user_id)
     friend_items = [
         {
             "friend_user_id": balance.friend_user_id,
@@ -108,7 +124,7 @@ async def chat_with_ai(
     system_prompt = _build_system_prompt(current_user.name, snapshot)
 
     try:
-        messages_payload = [message.dict() for message in trimmed]
+        messages_payload = [message.model_dump() for message in trimmed]
         reply = generate_financial_chat_response(
             messages=messages_payload,
             system_prompt=system_prompt,
@@ -1,7 +1,7 @@
 import logging
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Optional
 
 import jwt
 from fastapi import APIRouter, HTTPException, Request
@@ -18,6 +18,7 @@ from utils.constants import (
     REFRESH_COOKIE_NAME,
     REFRESH_TOKEN_EXPIRY,
 )
+from utils.middlewares.auth_user import parse_cookies
 
 logger = logging.getLogger(__name__)
 
@@ -40,17 +41,6 @@ REFRESH_COOKIE_OPTIONS = CookieOptions(
 router = APIRouter(prefix="/refresh")
 
 
-def parse_cookies(cookie_header: str) -> Dict[str, str]:
-    """Parse cookie header string into a dictionary"""
-    cookies = {}
-    if cookie_header:
-        for cookie in cookie_header.split(";"):
-            if "=" in cookie:
-                key, value = cookie.strip().split("=", 1)
-                cookies[key.strip()] = value
-    return cookies
-
-
 @router.post("")
 async def refresh_token(request: Request):
     """
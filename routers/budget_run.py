@@ -275,8 +275,10 @@ async def get_badges(
     logger.info(f"Getting badges for user {current_user.id}")
 
     try:
-        badges = budget_run_repo.get_user_badges(current_user.id)
-        return [_build_badge_info(b) for b in badges]
+        return [
+            _build_badge_info(b)
+            for b in budget_run_repo.iter_user_badges(current_user.id)
+        ]
     except Exception as e:
         logger.error(f"Error getting badges: {e}")
         raise HTTPException(status_code=500, detail="Failed to get badges")
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import List, Optional
 
@@ -66,7 +67,8 @@ async def create_link_token(
 ) -> LinkTokenResponse:
     """Create link token for Plaid Link initialization"""
     try:
-        result = plaid_client.create_link_token(
+        result = await asyncio.to_thread(
+            plaid_client.create_link_token,
             user_id=current_user.id, client_name=current_user.name
         )
         return LinkTokenResponse(**result)
@@ -88,7 +90,9 @@ async def exchange_public_token(
 ) -> PublicTokenExchangeResponse:
     """Exchange public token for access token and store in DB"""
     try:
-        result = plaid_client.exchange_public_token(
+        # Plaid exchange + item insert are blocking; keep them off the event loop.
+        result = await asyncio.to_thread(
+            plaid_client.exchange_public_token,
             public_token=request.public_token,
             user_id=current_user.id,
             institution_id=request.institution_id,
@@ -131,7 +135,9 @@ async def get_accounts(
 ) -> AccountsResponse:
     """Get all accounts from connected institution"""
     try:
-        accounts = plaid_client.get_accounts(user_id=current_user.id, item_id=item_id)
+        accounts = await asyncio.to_thread(
+            plaid_client.get_accounts, user_id=current_user.id, item_id=item_id
+        )
         return AccountsResponse(accounts=accounts)
     except PlaidItemNotFoundError as e:
         logger.error(f"Item not found: {e}")
@@ -153,7 +159,9 @@ async def get_accounts_by_item(
 ) -> AccountsResponse:
     """Get accounts for specific institution"""
     try:
-        accounts = plaid_client.get_accounts(user_id=current_user.id, item_id=item_id)
+        accounts = await asyncio.to_thread(
+            plaid_client.get_accounts, user_id=current_user.id, item_id=item_id
+        )
         return AccountsResponse(accounts=accounts)
     except PlaidItemNotFoundError as e:
         logger.error(f"Item not found: {e}")
@@ -176,7 +184,7 @@ async def get_institutions(
     """Get list of connected institutions"""
     try:
         logger.info(f"Fetching institutions for user {current_user.id}")
-        institutions = list_plaid_items_for_user(current_user.id)
+        institutions = await asyncio.to_thread(list_plaid_items_for_user, current_user.id)
         # Convert UserPlaidItem to Institution model
         institution_models = [
             Institution(
@@ -206,7 +214,9 @@ async def disconnect_institution(
 ) -> None:
     """Disconnect specific institution"""
     try:
-        plaid_client.disconnect_item(user_id=current_user.id, item_id=item_id)
+        await asyncio.to_thread(
+            plaid_client.disconnect_item, user_id=current_user.id, item_id=item_id
+        )
         return
     except PlaidItemNotFoundError as e:
         logger.error(f"Item not found: {e}")
@@ -233,7 +243,8 @@ async def get_transactions(
 ) -> TransactionsResponse:
     """Get transactions from all accounts with date filtering"""
     try:
-        result = plaid_client.get_transactions(
+        result = await asyncio.to_thread(
+            plaid_client.get_transactions,
             user_id=current_user.id,
             item_id=item_id,
             start_date=start_date,
@@ -265,7 +276,8 @@ async def get_transactions_by_account(
 ) -> TransactionsResponse:
     """Get transactions for specific account"""
     try:
-        result = plaid_client.get_transactions(
+        result = await asyncio.to_thread(
+            plaid_client.get_transactions,
             user_id=current_user.id,
             item_id=item_id,
             start_date=start_date,
@@ -294,7 +306,8 @@ async def sync_transactions(
 ) -> SyncResponse:
     """Manual sync for new transactions"""
     try:
-        result = plaid_client.sync_transactions(
+        result = await asyncio.to_thread(
+            plaid_client.sync_transactions,
             user_id=current_user.id, item_id=item_id
         )
         return result
@@ -339,7 +352,9 @@ async def get_item_status(
 ) -> ItemStatusResponse:
     """Check item status and health"""
     try:
-        status = plaid_client.get_item_status(user_id=current_user.id, item_id=item_id)
+        status = await asyncio.to_thread(
+            plaid_client.get_item_status, user_id=current_user.id, item_id=item_id
+        )
         return status
     except PlaidItemNotFoundError as e:
         logger.error(f"Item not found: {e}")
@@ -380,7 +395,9 @@ async def get_balances(
 ) -> BalancesResponse:
     """Get current balances for all accounts"""
     try:
-        balances = plaid_client.get_balances(user_id=current_user.id, item_id=item_id)
+        balances = await asyncio.to_thread(
+            plaid_client.get_balances, user_id=current_user.id, item_id=item_id
+        )
         return BalancesResponse(balances=balances)
     except PlaidItemNotFoundError as e:
         logger.error(f"Item not found: {e}")
@@ -9,6 +9,7 @@ from database.supabase import transaction as transaction_repo
 from database.supabase import transaction_split as split_repo
 from database.supabase import user as user_repo
 from database.supabase.balance import get_friend_balances_for_user
+from database.supabase.orm import parallel
 from database.supabase.transaction import Transaction
 from database.supabase.user import User
 from models.auth_user import AuthUser
@@ -259,21 +260,25 @@ async def list_splits_for_friend(
     friend_user_id: str,
     current_user: AuthUser = Depends(get_current_user),
 ) -> FriendSplitListResponse:
-    friend_user = user_repo.get_user_by_id(friend_user_id)
+    # The two authorization lookups are independent; splits are read only after
+    # both checks pass.
+    friend_user, friendship = parallel(
+        lambda: user_repo.get_user_by_id(friend_user_id),
+        lambda: friendship_repo.get_friendship(current_user.id, friend_user_id),
+    )
     if not friend_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Friend not found"
         )
 
-    friendship = friendship_repo.get_friendship(current_user.id, friend_user_id)
     if not friendship or friendship.status != "accepted":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Friendship not accepted"
         )
 
+    splits = split_repo.list_splits_between_users(current_user.id, friend_user_id)
     friend_model = _user_to_split_friend(friend_user)
 
-    splits = split_repo.list_splits_between_users(current_user.id, friend_user_id)
     items: List[FriendSplitListItem] = []
     you_owe = 0.0
     they_owe = 0.0
@@ -347,7 +352,10 @@ async def get_split_detail(
             detail="You are not part of this split",
         )
 
-    transaction = transaction_repo.get_transaction_by_id(split.transaction_id)
+    transaction, transaction_splits = parallel(
+        lambda: transaction_repo.get_transaction_by_id(split.transaction_id),
+        lambda: split_repo.list_splits_for_transaction(split.transaction_id),
+    )
     if not transaction:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found"
@@ -355,7 +363,7 @@ async def get_split_detail(
 
     participants_models, split_total = _build_participants(
         transaction=transaction,
-        splits=split_repo.list_splits_for_transaction(transaction.id),
+        splits=transaction_splits,
         current_user=current_user,
     )
 
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends
 
 from database.supabase.transaction import (
     get_spending_by_category_for_user,
-    list_transactions_for_user,
+    iter_transactions_for_user,
 )
 from models.auth_user import AuthUser
 from models.transaction import (
@@ -36,8 +36,7 @@ def _to_transaction_response_list(
 ) -> List[TransactionResponse]:
     responses: List[TransactionResponse] = []
     for txn in transactions:
-        data = txn.model_dump() if hasattr(txn, "model_dump") else txn.dict()
-        responses.append(TransactionResponse(**data))
+        responses.append(TransactionResponse.model_validate(txn, from_attributes=True))
     return responses
 
 
@@ -46,9 +45,9 @@ async def get_user_transactions(
     current_user: AuthUser = Depends(get_current_user),
 ) -> UserTransactionsResponse:
     """Return transactions for the authenticated user sorted from newest to oldest."""
-    transactions = list_transactions_for_user(current_user.id)
+    transactions = _to_transaction_response_list(iter_transactions_for_user(current_user.id))
     logger.info("Fetched %s transactions for user %s", len(transactions), current_user.id)
-    return UserTransactionsResponse(transactions=_to_transaction_response_list(transactions))
+    return UserTransactionsResponse(transactions=transactions)
 
 
 @router.get("/summary", response_model=TransactionSummaryResponse)
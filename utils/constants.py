@@ -30,6 +30,18 @@ REFRESH_TOKEN_EXPIRY = int(os.getenv("REFRESH_TOKEN_EXPIRY", "2592000"))
 
 # Supabase database configuration
 SUPABASE_DB_URL = os.getenv("SUPABASE_DB_URL")
+DB_POOL_MIN_CONN = int(os.getenv("DB_POOL_MIN_CONN", "2"))
+DB_POOL_MAX_CONN = int(os.getenv("DB_POOL_MAX_CONN", "20"))
+# How long a checkout waits for a free pooled connection before giving up.
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+# Pooled connections older than this are closed and reopened on checkout.
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+# Server-side statement_timeout for pooled connections, in milliseconds (0 disables).
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+DB_APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "chippr-backend")
+# Per-process user lookup cache (database/supabase/user.py).
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
 MIGRATIONS_DIR = os.path.join(
     os.path.dirname(__file__), "..", "database", "supabase", "migrations"
 )
@@ -41,3 +53,6 @@ ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY", "is4ArmmmNSnGB13GZy9Kl2u8TWf0y441If
 PLAID_CLIENT_ID = os.getenv("PLAID_CLIENT_ID")
 PLAID_SECRET = os.getenv("PLAID_SECRET")
 PLAID_ENV = os.getenv("PLAID_ENV", "sandbox")
+# Per-process cache of decrypted access tokens (integrations/plaid.py).
+PLAID_TOKEN_CACHE_TTL_SECONDS = float(os.getenv("PLAID_TOKEN_CACHE_TTL_SECONDS", "30"))
+PLAID_TOKEN_CACHE_MAX_SIZE = int(os.getenv("PLAID_TOKEN_CACHE_MAX_SIZE", "4096"))
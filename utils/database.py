@@ -1,8 +1,15 @@
-from typing import Any, TypeVar
+import dataclasses
+import io
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, TypeVar
 
 from pydantic import BaseModel
 
 T = TypeVar("T", bound=BaseModel)
+# Row types the generated builders accept: Pydantic models or (slotted) dataclasses.
+R = TypeVar("R")
+
+FETCH_BATCH_SIZE = 200
 
 
 def row_to_model(row: tuple, model_class: type[T], column_names: list[str]) -> T:
@@ -24,7 +31,9 @@ def row_to_model(row: tuple, model_class: type[T], column_names: list[str]) -> T
     return model_class(**row_dict)
 
 
-def row_to_model_with_cursor(row: tuple, model_class: type[T], cursor) -> T:
+def row_to_model_with_cursor(
+    row: tuple, model_class: type[T], cursor, *, trusted: bool = False
+) -> T:
     """
     Convert a database row tuple to a Pydantic BaseModel instance using cursor description.
 
@@ -32,11 +41,153 @@ def row_to_model_with_cursor(row: tuple, model_class: type[T], cursor) -> T:
         row: Database row tuple
         model_class: Pydantic BaseModel class
         cursor: Database cursor with executed query
+        trusted: Skip validation (see construct_model_with_cursor) for rows whose
+            column types already match the model
 
     Returns:
         Instance of the specified model class
     """
-    # Get column names from cursor description
-    column_names = [desc[0] for desc in cursor.description]
+    if trusted:
+        return construct_model_with_cursor(row, model_class, cursor)
+    column_index = _column_index(tuple(desc[0] for desc in cursor.description))
+    return model_class(**{name: row[index] for name, index in column_index.items()})
+
+
+@lru_cache(maxsize=64)
+def _column_index(column_names: tuple[str, ...]) -> dict[str, int]:
+    """Map each result column name to its position (a repeated name keeps the last)."""
+    return {name: index for index, name in enumerate(column_names)}
+
+
+@lru_cache(maxsize=256)
+def _row_builder(model_class: type, column_names: tuple[str, ...]) -> Callable[[tuple], Any]:
+    """
+    Generate a straight-line row -> model constructor for one result shape.
+
+    The emitted function is ``construct(field=row[i], ...)`` for the result columns
+    that map onto model fields, so per-row work is just tuple indexing. ``construct``
+    is model_construct() for Pydantic models and the class itself for dataclasses;
+    field names are always valid identifiers.
+    """
+    if dataclasses.is_dataclass(model_class):
+        fields = {field.name for field in dataclasses.fields(model_class)}
+        construct = model_class
+    else:
+        fields = model_class.model_fields
+        construct = model_class.model_construct
+    positions = {
+        name: index for name, index in _column_index(column_names).items() if name in fields
+    }
+    args = ", ".join(f"{name}=row[{index}]" for name, index in positions.items())
+    namespace: dict[str, Any] = {"construct": construct}
+    exec(f"def build(row):\n    return construct({args})\n", namespace)
+    return namespace["build"]
 
-    return row_to_model(row, model_class, column_names)
+
+def model_builder(
+    model_class: type[R], column_names: tuple[str, ...]
+) -> Callable[[tuple], R]:
+    """
+    Return the generated row constructor for a statement whose columns are known.
+
+    For SELECT/RETURNING lists fixed at import time this skips reading
+    cursor.description on every call.
+
+    Args:
+        model_class: Pydantic BaseModel class or dataclass
+        column_names: Result column names in select-list order
+
+    Returns:
+        Function building one model instance from one row tuple
+    """
+    return _row_builder(model_class, column_names)
+
+
+def construct_model_with_cursor(row: tuple, model_class: type[R], cursor) -> R:
+    """
+    Build a single Pydantic BaseModel (or dataclass) instance from a trusted database row.
+
+    Same fast path as row_to_models_with_cursor(): the cached generated
+    constructor around model_construct(), without a validation pass.
+
+    Args:
+        row: Database row tuple
+        model_class: Pydantic BaseModel class
+        cursor: Database cursor with executed query
+
+    Returns:
+        Instance of the specified model class
+    """
+    column_names = tuple(desc[0] for desc in cursor.description)
+    return _row_builder(model_class, column_names)(row)
+
+
+def row_to_models_with_cursor(rows: list[tuple], model_class: type[R], cursor) -> list[R]:
+    """
+    Convert a batch of database rows to Pydantic BaseModel (or dataclass) instances.
+
+    Column names are resolved once per batch and a generated constructor is cached
+    per (model, columns) pair. Rows are built with model_construct(), so the
+    values must already have the declared field types (see orm.py for the NUMERIC
+    typecaster that guarantees this for amounts).
+
+    Args:
+        rows: Database row tuples from the same result set
+        model_class: Pydantic BaseModel class
+        cursor: Database cursor with executed query
+
+    Returns:
+        List of instances of the specified model class
+    """
+    if not rows:
+        return []
+    column_names = tuple(desc[0] for desc in cursor.description)
+    build = _row_builder(model_class, column_names)
+    return [build(row) for row in rows]
+
+
+def iter_models_with_cursor(
+    cursor, model_class: type[R], batch_size: int = FETCH_BATCH_SIZE
+) -> Iterator[R]:
+    """
+    Lazily convert the rows of an executed cursor into Pydantic BaseModel instances.
+
+    Rows are pulled with fetchmany() so only one batch is held in memory at a time.
+    Works with both client-side and named (server-side) cursors; for the latter the
+    cursor description is only available after the first fetch.
+
+    Args:
+        cursor: Database cursor with executed query
+        model_class: Pydantic BaseModel class
+        batch_size: Number of rows to fetch per round trip
+
+    Yields:
+        Instances of the specified model class
+    """
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield from row_to_models_with_cursor(rows, model_class, cursor)
+
+
+def _copy_csv_field(value: Any) -> str:
+    """Render a value for COPY ... (FORMAT csv): NULL unquoted, everything else quoted."""
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def copy_csv_buffer(rows: Iterable[Iterable[Any]]) -> io.StringIO:
+    """
+    Serialize rows into a rewound buffer for cursor.copy_expert(... FORMAT csv).
+
+    None is written as an unquoted empty field (NULL); every other value is quoted,
+    so empty strings survive as ''.
+    """
+    buf = io.StringIO()
+    for row in rows:
+        buf.write(",".join(_copy_csv_field(value) for value in row))
+        buf.write("\n")
+    buf.seek(0)
+    return buf
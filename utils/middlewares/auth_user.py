@@ -1,4 +1,5 @@
 import logging
+import re
 from typing import Dict, Optional
 
 import jwt
@@ -13,15 +14,15 @@ from business.user import get_or_create_user_from_auth
 logger = logging.getLogger(__name__)
 
 
+# One "name=value" pair of a Cookie header; segments without "=" are skipped.
+_COOKIE_PAIR = re.compile(r"\s*([^;=]+?)\s*=([^;]*?)\s*(?:;|$)")
+
+
 def parse_cookies(cookie_header: str) -> Dict[str, str]:
     """Parse cookie header string into a dictionary"""
-    cookies = {}
-    if cookie_header:
-        for cookie in cookie_header.split(";"):
-            if "=" in cookie:
-                key, value = cookie.strip().split("=", 1)
-                cookies[key.strip()] = value
-    return cookies
+    if not cookie_header:
+        return {}
+    return dict(_COOKIE_PAIR.findall(cookie_header))
 
 
 def extract_token_from_request(request: Request) -> Optional[str]:
@@ -94,7 +95,7 @@ def get_current_user(request: Request) -> AuthUser:
     try:
         database_uuid = get_or_create_user_from_auth(auth_user)
         # Set the database UUID in the auth user
-        auth_user.id = str(database_uuid)
+        auth_user.id = database_uuid
     except Exception as e:
         logger.error(f"Error creating/getting user from auth: {e}")
         # Don't fail the request if user creation fails, just log it